@@ -14,9 +14,12 @@ class Actuator:
         self.obj2 = obj2
         self.anchor1 = anchor1
         self.anchor2 = anchor2
+        # resolved once so the per-step endpoint lookups skip the box check
+        self._anchored1 = bool(self._is_box(obj1) and anchor1)
+        self._anchored2 = bool(self._is_box(obj2) and anchor2)
 
-        p1 = self._get_world_position(obj1, anchor1)
-        p2 = self._get_world_position(obj2, anchor2)
+        p1 = self._get_world_position(obj1, anchor1, self._anchored1)
+        p2 = self._get_world_position(obj2, anchor2, self._anchored2)
         dx = p2.x - p1.x
         dy = p2.y - p1.y
         self.rest_length = (dx * dx + dy * dy) ** 0.5
@@ -31,30 +34,41 @@ class Actuator:
     def _is_box(self, obj):
         return hasattr(obj, "get_local_anchors")
 
-    def _get_local_anchor(self, obj, anchor):
-        if self._is_box(obj) and anchor:
-            return obj.get_local_anchors()[anchor]
-        return Vector(0, 0)
-
-    def _get_world_position(self, obj, anchor):
-        if self._is_box(obj) and anchor:
+    def _get_world_position(self, obj, anchor, anchored):
+        if anchored:
             return obj.get_world_anchor(anchor)
         return Vector(obj.body.position.x, obj.body.position.y)
 
+    def _get_world_arm(self, obj, anchor, anchored):
+        body = obj.body
+        if not anchored:
+            return body.position.x, body.position.y, 0.0, 0.0
+        lx, ly = obj.get_local_anchor(anchor)
+        cos_a, sin_a = obj._trig()
+        lc = lx * cos_a
+        ls = lx * sin_a
+        rc = ly * cos_a
+        rs = ly * sin_a
+        wx = body.position.x + lc - rs
+        wy = body.position.y + ls + rc
+        return wx, wy, lc - rs, ls + rc
+
     def get_endpoint1(self):
-        pos = self._get_world_position(self.obj1, self.anchor1)
+        pos = self._get_world_position(self.obj1, self.anchor1, self._anchored1)
         return (pos.x, pos.y)
 
     def get_endpoint2(self):
-        pos = self._get_world_position(self.obj2, self.anchor2)
+        pos = self._get_world_position(self.obj2, self.anchor2, self._anchored2)
         return (pos.x, pos.y)
 
+    def _get_endpoints(self):
+        p1 = self._get_world_position(self.obj1, self.anchor1, self._anchored1)
+        p2 = self._get_world_position(self.obj2, self.anchor2, self._anchored2)
+        return p1.x, p1.y, p2.x, p2.y
+
     def cur_length(self):
-        p1 = self._get_world_position(self.obj1, self.anchor1)
-        p2 = self._get_world_position(self.obj2, self.anchor2)
-        dx = p2.x - p1.x
-        dy = p2.y - p1.y
-        return (dx * dx + dy * dy) ** 0.5
+        x1, y1, x2, y2 = self._get_endpoints()
+        return math.hypot(x2 - x1, y2 - y1)
 
     def set_activation(self, value):
         self.target_activation = max(0.0, min(1.0, value))
@@ -66,11 +80,22 @@ class Actuator:
     def apply_forces(self, dt):
         self.update_activation(dt)
 
-        p1 = self._get_world_position(self.obj1, self.anchor1)
-        p2 = self._get_world_position(self.obj2, self.anchor2)
+        body1 = self.obj1.body
+        body2 = self.obj2.body
+        if not (
+            body1.inv_mass or body1.inv_moi or body2.inv_mass or body2.inv_moi
+        ):
+            # neither end can move or turn, so the forces would never be used
+            return
+        p1x, p1y, r1_x, r1_y = self._get_world_arm(
+            self.obj1, self.anchor1, self._anchored1
+        )
+        p2x, p2y, r2_x, r2_y = self._get_world_arm(
+            self.obj2, self.anchor2, self._anchored2
+        )
 
-        dx = p2.x - p1.x
-        dy = p2.y - p1.y
+        dx = p2x - p1x
+        dy = p2y - p1y
         length = (dx * dx + dy * dy) ** 0.5
 
         if length < 1e-6:
@@ -81,23 +106,12 @@ class Actuator:
 
         stretch = length - self.rest_length
 
-        local1 = self._get_local_anchor(self.obj1, self.anchor1)
-        local2 = self._get_local_anchor(self.obj2, self.anchor2)
-
-        cos1 = math.cos(self.obj1.body.orientation)
-        sin1 = math.sin(self.obj1.body.orientation)
-        r1_x = local1.x * cos1 - local1.y * sin1
-        r1_y = local1.x * sin1 + local1.y * cos1
-
-        cos2 = math.cos(self.obj2.body.orientation)
-        sin2 = math.sin(self.obj2.body.orientation)
-        r2_x = local2.x * cos2 - local2.y * sin2
-        r2_y = local2.x * sin2 + local2.y * cos2
-
-        v1_x = self.obj1.body.velocity.x - self.obj1.body.ang_velocity * r1_y
-        v1_y = self.obj1.body.velocity.y + self.obj1.body.ang_velocity * r1_x
-        v2_x = self.obj2.body.velocity.x - self.obj2.body.ang_velocity * r2_y
-        v2_y = self.obj2.body.velocity.y + self.obj2.body.ang_velocity * r2_x
+        w1 = body1.ang_velocity
+        w2 = body2.ang_velocity
+        v1_x = body1.velocity.x - w1 * r1_y
+        v1_y = body1.velocity.y + w1 * r1_x
+        v2_x = body2.velocity.x - w2 * r2_y
+        v2_y = body2.velocity.y + w2 * r2_x
 
         rel_vel = (v2_x - v1_x) * dir_x + (v2_y - v1_y) * dir_y
 
@@ -114,29 +128,25 @@ class Actuator:
         fx = force_mag * dir_x
         fy = force_mag * dir_y
 
-        self.obj1.body.apply_point_force(Vector(fx, fy), p1)
-        self.obj2.body.apply_point_force(Vector(-fx, -fy), p2)
+        body1.apply_force_at(fx, fy, p1x, p1y)
+        body2.apply_force_at(-fx, -fy, p2x, p2y)
 
 
     def contains(self, x, y):
-        x1, y1 = self.get_endpoint1()
-        x2, y2 = self.get_endpoint2()
+        x1, y1, x2, y2 = self._get_endpoints()
 
-        line_len = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-        if line_len == 0:
+        ex = x2 - x1
+        ey = y2 - y1
+        line_len2 = ex * ex + ey * ey
+        if line_len2 == 0:
             return False
 
-        t = max(
-            0,
-            min(
-                1, ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / (line_len**2)
-            ),
-        )
-        proj_x = x1 + t * (x2 - x1)
-        proj_y = y1 + t * (y2 - y1)
+        t = ((x - x1) * ex + (y - y1) * ey) / line_len2
+        t = 0 if t < 0 else (1 if t > 1 else t)
+        dx = x - (x1 + t * ex)
+        dy = y - (y1 + t * ey)
 
-        dist = ((x - proj_x) ** 2 + (y - proj_y) ** 2) ** 0.5
-        return dist <= 10
+        return dx * dx + dy * dy <= 100
 
     def get_debug_info(self):
         current_len = self.cur_length()
@@ -157,16 +167,31 @@ class Actuator:
             "damping": round(self.damping, 2),
         }
 
+    def _set_rest_length(self, value):
+        self.rest_length = max(1, float(value))
+
+    def _set_activation(self, value):
+        self.set_activation(float(value))
+
+    def _set_max_force(self, value):
+        self.max_force = max(0, float(value))
+
+    def _set_max_stiffness(self, value):
+        self.max_stiffness = max(0, float(value))
+
+    def _set_damping(self, value):
+        self.damping = max(0, float(value))
+
+    _SETTERS = {
+        "rest_length": _set_rest_length,
+        "activation": _set_activation,
+        "target_act": _set_activation,
+        "max_force": _set_max_force,
+        "max_stiffness": _set_max_stiffness,
+        "damping": _set_damping,
+    }
+
     def set_property(self, key, value):
-        if key == "rest_length":
-            self.rest_length = max(1, float(value))
-        elif key == "activation":
-            self.set_activation(float(value))
-        elif key == "target_act":
-            self.set_activation(float(value))
-        elif key == "max_force":
-            self.max_force = max(0, float(value))
-        elif key == "max_stiffness":
-            self.max_stiffness = max(0, float(value))
-        elif key == "damping":
-            self.damping = max(0, float(value))
+        setter = self._SETTERS.get(key)
+        if setter is not None:
+            setter(self, value)
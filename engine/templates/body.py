@@ -5,6 +5,25 @@ from typing import Literal
 
 
 class Body:
+    __slots__ = (
+        "shape",
+        "radius",
+        "height",
+        "width",
+        "position",
+        "velocity",
+        "mass",
+        "inv_mass",
+        "total_force",
+        "restitution",
+        "friction",
+        "orientation",
+        "ang_velocity",
+        "moi",
+        "inv_moi",
+        "total_torque",
+    )
+
     def __init__(
         self,
         mass: float = 0.0,
@@ -54,6 +73,14 @@ class Body:
         torque = cross(r, force)
         self.total_torque += torque
 
+    def apply_force_at(self, fx: float, fy: float, px: float, py: float):
+        # apply_point_force on plain floats
+        self.total_force.x += fx
+        self.total_force.y += fy
+        rx = self.position.x - px
+        ry = self.position.y - py
+        self.total_torque += rx * fy - ry * fx
+
     def clear_forces(self):
         self.total_force = Vector(0, 0)
 
@@ -66,15 +93,18 @@ class Body:
 
     def integrate(self, dt):
         # semi euler's method
-        a = Vector(
-            self.total_force.x * self.inv_mass,
-            self.total_force.y * self.inv_mass,
-        )
-        self.velocity.add(Vector(a.x * dt, a.y * dt))
-        self.position.add(Vector(self.velocity.x * dt, self.velocity.y * dt))
+        force = self.total_force
+        velocity = self.velocity
+        position = self.position
+        inv_mass = self.inv_mass
+        velocity.x += force.x * inv_mass * dt
+        velocity.y += force.y * inv_mass * dt
+        position.x += velocity.x * dt
+        position.y += velocity.y * dt
 
         ang_a = self.total_torque * self.inv_moi
         self.ang_velocity = self.ang_velocity + ang_a * dt
         self.orientation += self.ang_velocity * dt
         self.total_torque = 0.0
-        self.total_force = Vector(0, 0)
+        force.x = 0
+        force.y = 0
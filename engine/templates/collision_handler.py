@@ -2,41 +2,73 @@ from engine.templates.body import Body
 from engine.templates.vector import Vector
 import math
 
+# padding so float noise in the narrow phase can never see a contact that
+# the AABB test rejected
+AABB_MARGIN = 1.0
+
+
+def get_aabb(body: Body):
+    x, y = body.position.x, body.position.y
+    if body.shape == "circle":
+        ex = ey = body.radius
+    elif body.shape == "rectangle":
+        c = abs(math.cos(body.orientation))
+        s = abs(math.sin(body.orientation))
+        hw, hh = body.width / 2, body.height / 2
+        ex = hw * c + hh * s
+        ey = hw * s + hh * c
+    else:
+        return (float("-inf"), float("-inf"), float("inf"), float("inf"))
+    ex += AABB_MARGIN
+    ey += AABB_MARGIN
+    return (x - ex, y - ey, x + ex, y + ey)
+
+
+def all_finite(box):
+    return (
+        math.isfinite(box[0])
+        and math.isfinite(box[1])
+        and math.isfinite(box[2])
+        and math.isfinite(box[3])
+    )
+
 
 def get_rectangle_corners(body: Body):
     cx, cy = body.position.x, body.position.y
     hw, hh = body.width / 2, body.height / 2
     angle = body.orientation
     cos_a, sin_a = math.cos(angle), math.sin(angle)
+    # each corner is (+-hw, +-hh) rotated; the four products are shared
+    wc = hw * cos_a
+    ws = hw * sin_a
+    hc = hh * cos_a
+    hs = hh * sin_a
     corners = [
-        Vector(
-            cx + (-hw * cos_a - (-hh) * sin_a),
-            cy + (-hw * sin_a + (-hh) * cos_a),
-        ),
-        Vector(
-            cx + (hw * cos_a - (-hh) * sin_a), cy + (hw * sin_a + (-hh) * cos_a)
-        ),
-        Vector(cx + (hw * cos_a - hh * sin_a), cy + (hw * sin_a + hh * cos_a)),
-        Vector(
-            cx + (-hw * cos_a - hh * sin_a), cy + (-hw * sin_a + hh * cos_a)
-        ),
+        Vector(cx + (-wc + hs), cy + (-ws - hc)),
+        Vector(cx + (wc + hs), cy + (ws - hc)),
+        Vector(cx + (wc - hs), cy + (ws + hc)),
+        Vector(cx + (-wc - hs), cy + (-ws + hc)),
     ]
     return corners
 
 
 def get_rectangle_axes(body: Body):
+    # (x, y) tuples; the axes never leave the SAT test, so no Vectors
     angle = body.orientation
     cos_a, sin_a = math.cos(angle), math.sin(angle)
-    return [Vector(cos_a, sin_a), Vector(-sin_a, cos_a)]
+    return [(cos_a, sin_a), (-sin_a, cos_a)]
 
 
 def project_polygon(corners, axis):
     min_proj = float("inf")
     max_proj = float("-inf")
+    ax, ay = axis
     for corner in corners:
-        proj = corner.x * axis.x + corner.y * axis.y
-        min_proj = min(min_proj, proj)
-        max_proj = max(max_proj, proj)
+        proj = corner.x * ax + corner.y * ay
+        if proj < min_proj:
+            min_proj = proj
+        if proj > max_proj:
+            max_proj = proj
     return min_proj, max_proj
 
 
@@ -99,6 +131,7 @@ class Collision_Handler:
         self.resting_threshold = resting_threshold
         self.iterations = iterations
         self.ground = None  # Ground body reference for special handling
+        self._sweep_order = []
 
     def set_ground(self, ground_body: Body):
         
@@ -108,8 +141,10 @@ class Collision_Handler:
         self.bodies.append(body)
 
     def remove_body(self, body: Body):
-        if body in self.bodies:
+        try:
             self.bodies.remove(body)
+        except ValueError:
+            pass
 
     def detect_ground_collision(self, body: Body):
         if self.ground is None:
@@ -160,30 +195,94 @@ class Collision_Handler:
         
         return None
 
+    def static_boxes(self):
+        # bodies with no inverse mass (the ground, pinned bobs and boxes) are
+        # never moved by the contact solver, so their boxes hold for every
+        # iteration of an update; None marks a body that has to be re-boxed
+        return [get_aabb(b) if b.inv_mass == 0 else None for b in self.bodies]
+
+    def find_pairs(self, static_boxes=None):
+        # candidate pairs in the same (i, j) order as a full i < j scan, so
+        # the narrow phase and the stable penetration sort see the same
+        # sequence as before. the ground sweeps like any other box: its
+        # huge width keeps it active for every body, and only bodies whose
+        # box reaches its top are paired with it
+        bodies = self.bodies
+        if static_boxes is None:
+            boxes = [get_aabb(b) for b in bodies]
+        else:
+            boxes = [
+                get_aabb(b) if box is None else box
+                for b, box in zip(bodies, static_boxes)
+            ]
+        return [(bodies[i], bodies[j]) for i, j in self._sweep_pairs(boxes)]
+
+    def _sweep_pairs(self, boxes):
+        # sort-and-sweep along x. the order persists between calls and is
+        # fixed up with an insertion sort, which is close to linear because
+        # bodies barely move relative to each other from one step to the next
+        n = len(boxes)
+        everywhere = [i for i, box in enumerate(boxes) if not all_finite(box)]
+        skip = set(everywhere)
+        order = self._sweep_order
+        if len(order) != n:
+            order = [i for i in range(n) if i not in skip]
+            order.sort(key=lambda i: boxes[i][0])
+        else:
+            order = [i for i in order if i not in skip]
+            for k in range(1, len(order)):
+                idx = order[k]
+                key = boxes[idx][0]
+                m = k - 1
+                while m >= 0 and boxes[order[m]][0] > key:
+                    order[m + 1] = order[m]
+                    m -= 1
+                order[m + 1] = idx
+        self._sweep_order = order + everywhere
+
+        pairs = []
+        active = []
+        for i in order:
+            a = boxes[i]
+            min_x = a[0]
+            still = []
+            for j in active:
+                b = boxes[j]
+                if b[2] < min_x:
+                    continue
+                still.append(j)
+                if not (a[3] < b[1] or b[3] < a[1]):
+                    pairs.append((j, i) if j < i else (i, j))
+            still.append(i)
+            active = still
+        for i in everywhere:
+            for j in range(n):
+                if j != i and (j not in skip or j > i):
+                    pairs.append((i, j) if i < j else (j, i))
+        pairs.sort()
+        return pairs
+
     def update(self):
+        static_boxes = self.static_boxes()
+        ground = self.ground
         for _ in range(self.iterations):
             collisions = []
-            for i in range(len(self.bodies)):
-                for j in range(i + 1, len(self.bodies)):
-                    b1 = self.bodies[i]
-                    b2 = self.bodies[j]
-                    
-                    
-                    if self.ground is not None and b2 == self.ground:
-                        result = self.detect_ground_collision(b1)
-                        if result is not None:
-                            n, penetration, contact_point = result
-                            collisions.append((b1, b2, n, penetration, contact_point))
-                    elif self.ground is not None and b1 == self.ground:
-                        result = self.detect_ground_collision(b2)
-                        if result is not None:
-                            n, penetration, contact_point = result
-                            collisions.append((b2, b1, n, penetration, contact_point))
-                    else:
-                        result = self.detect_collision(b1, b2)
-                        if result is not None:
-                            n, penetration, contact_point = result
-                            collisions.append((b1, b2, n, penetration, contact_point))
+            for b1, b2 in self.find_pairs(static_boxes):
+                if b2 is ground:
+                    result = self.detect_ground_collision(b1)
+                    if result is not None:
+                        n, penetration, contact_point = result
+                        collisions.append((b1, b2, n, penetration, contact_point))
+                elif b1 is ground:
+                    result = self.detect_ground_collision(b2)
+                    if result is not None:
+                        n, penetration, contact_point = result
+                        collisions.append((b2, b1, n, penetration, contact_point))
+                else:
+                    result = self.detect_collision(b1, b2)
+                    if result is not None:
+                        n, penetration, contact_point = result
+                        collisions.append((b1, b2, n, penetration, contact_point))
 
             if not collisions:
                 break  
@@ -223,7 +322,7 @@ class Collision_Handler:
             axes = get_rectangle_axes(b1) + get_rectangle_axes(b2)
 
             min_overlap = float("inf")
-            collision_normal = None
+            best_axis = None
 
             for axis in axes:
                 min1, max1 = project_polygon(corners1, axis)
@@ -236,10 +335,12 @@ class Collision_Handler:
 
                 if overlap < min_overlap:
                     min_overlap = overlap
-                    collision_normal = Vector(
-                        axis.x * direction, axis.y * direction
-                    )
+                    best_axis = (axis, direction)
 
+            collision_normal = None
+            if best_axis is not None:
+                (ax, ay), direction = best_axis
+                collision_normal = Vector(ax * direction, ay * direction)
             penetration = min_overlap
 
             contact_points = []
@@ -350,27 +451,6 @@ class Collision_Handler:
 
         return world_normal, penetration, world_contact
 
-    def compute_relative_velocity(
-        self, b1: Body, b2: Body, contact_point: Vector
-    ):
-        r1 = Vector(
-            contact_point.x - b1.position.x, contact_point.y - b1.position.y
-        )
-        r2 = Vector(
-            contact_point.x - b2.position.x, contact_point.y - b2.position.y
-        )
-        v1_at_contact = Vector(
-            b1.velocity.x - b1.ang_velocity * r1.y,
-            b1.velocity.y + b1.ang_velocity * r1.x,
-        )
-        v2_at_contact = Vector(
-            b2.velocity.x - b2.ang_velocity * r2.y,
-            b2.velocity.y + b2.ang_velocity * r2.x,
-        )
-        return Vector(
-            v2_at_contact.x - v1_at_contact.x, v2_at_contact.y - v1_at_contact.y
-        )
-
     def resolve_collision(
         self,
         b1: Body,
@@ -380,15 +460,25 @@ class Collision_Handler:
         contact_point: Vector,
     ):
         self.apply_pos_corr(b1, b2, n, penetration)
-        
-        rel_vel = self.compute_relative_velocity(b1, b2, contact_point)
-        vel_along_normal = rel_vel.x * n.x + rel_vel.y * n.y
+
+        nx, ny = n.x, n.y
+        r1_x = contact_point.x - b1.position.x
+        r1_y = contact_point.y - b1.position.y
+        r2_x = contact_point.x - b2.position.x
+        r2_y = contact_point.y - b2.position.y
+        rel_vel_x = (b2.velocity.x - b2.ang_velocity * r2_y) - (
+            b1.velocity.x - b1.ang_velocity * r1_y
+        )
+        rel_vel_y = (b2.velocity.y + b2.ang_velocity * r2_x) - (
+            b1.velocity.y + b1.ang_velocity * r1_x
+        )
+        vel_along_normal = rel_vel_x * nx + rel_vel_y * ny
 
         if vel_along_normal > 0:
-            n = Vector(-n.x, -n.y)
+            nx, ny = -nx, -ny
             vel_along_normal = -vel_along_normal
 
-        self.apply_impulse(b1, b2, n, contact_point, vel_along_normal)
+        self.apply_impulse(b1, b2, nx, ny, contact_point, vel_along_normal)
 
     def apply_pos_corr(self, b1: Body, b2: Body, n: Vector, penetration: float):
         total_inv_mass = b1.inv_mass + b2.inv_mass
@@ -403,38 +493,35 @@ class Collision_Handler:
             / total_inv_mass
         )
 
-        correction = Vector(
-            n.x * correction_magnitude, n.y * correction_magnitude
-        )
+        correction_x = n.x * correction_magnitude
+        correction_y = n.y * correction_magnitude
 
-        b1.position.x -= correction.x * b1.inv_mass
-        b1.position.y -= correction.y * b1.inv_mass
-        b2.position.x += correction.x * b2.inv_mass
-        b2.position.y += correction.y * b2.inv_mass
+        b1.position.x -= correction_x * b1.inv_mass
+        b1.position.y -= correction_y * b1.inv_mass
+        b2.position.x += correction_x * b2.inv_mass
+        b2.position.y += correction_y * b2.inv_mass
 
     def apply_impulse(
-        self, b1: Body, b2: Body, n: Vector, contact_point: Vector, vel_along_normal: float
+        self,
+        b1: Body,
+        b2: Body,
+        nx: float,
+        ny: float,
+        contact_point: Vector,
+        vel_along_normal: float,
     ):
         friction = math.sqrt(b1.friction * b2.friction)
 
-        r1 = Vector(
-            contact_point.x - b1.position.x, contact_point.y - b1.position.y
-        )
-        r2 = Vector(
-            contact_point.x - b2.position.x, contact_point.y - b2.position.y
-        )
+        r1_x = contact_point.x - b1.position.x
+        r1_y = contact_point.y - b1.position.y
+        r2_x = contact_point.x - b2.position.x
+        r2_y = contact_point.y - b2.position.y
 
-        v1_at_contact = Vector(
-            b1.velocity.x - b1.ang_velocity * r1.y,
-            b1.velocity.y + b1.ang_velocity * r1.x,
-        )
-        v2_at_contact = Vector(
-            b2.velocity.x - b2.ang_velocity * r2.y,
-            b2.velocity.y + b2.ang_velocity * r2.x,
+        rel_vel_x = (b2.velocity.x - b2.ang_velocity * r2_y) - (
+            b1.velocity.x - b1.ang_velocity * r1_y
         )
-
-        rel_vel = Vector(
-            v2_at_contact.x - v1_at_contact.x, v2_at_contact.y - v1_at_contact.y
+        rel_vel_y = (b2.velocity.y + b2.ang_velocity * r2_x) - (
+            b1.velocity.y + b1.ang_velocity * r1_x
         )
 
         if abs(vel_along_normal) < self.resting_threshold:
@@ -442,8 +529,8 @@ class Collision_Handler:
         else:
             restitution = math.sqrt(b1.restitution * b2.restitution)
 
-        r1_cross_n = r1.x * n.y - r1.y * n.x
-        r2_cross_n = r2.x * n.y - r2.y * n.x
+        r1_cross_n = r1_x * ny - r1_y * nx
+        r2_cross_n = r2_x * ny - r2_y * nx
 
         inv_mass_sum = (
             b1.inv_mass
@@ -458,31 +545,31 @@ class Collision_Handler:
         j = -(1 + restitution) * vel_along_normal / inv_mass_sum
         j = max(j, 0)
 
-        impulse = Vector(n.x * j, n.y * j)
+        impulse_x = nx * j
+        impulse_y = ny * j
 
-        b1.velocity.x -= impulse.x * b1.inv_mass
-        b1.velocity.y -= impulse.y * b1.inv_mass
-        b2.velocity.x += impulse.x * b2.inv_mass
-        b2.velocity.y += impulse.y * b2.inv_mass
+        b1.velocity.x -= impulse_x * b1.inv_mass
+        b1.velocity.y -= impulse_y * b1.inv_mass
+        b2.velocity.x += impulse_x * b2.inv_mass
+        b2.velocity.y += impulse_y * b2.inv_mass
 
-        b1.ang_velocity -= (r1.x * impulse.y - r1.y * impulse.x) * b1.inv_moi
-        b2.ang_velocity += (r2.x * impulse.y - r2.y * impulse.x) * b2.inv_moi
+        b1.ang_velocity -= (r1_x * impulse_y - r1_y * impulse_x) * b1.inv_moi
+        b2.ang_velocity += (r2_x * impulse_y - r2_y * impulse_x) * b2.inv_moi
 
-        tangent = Vector(
-            rel_vel.x - vel_along_normal * n.x,
-            rel_vel.y - vel_along_normal * n.y,
-        )
+        tangent_x = rel_vel_x - vel_along_normal * nx
+        tangent_y = rel_vel_y - vel_along_normal * ny
         tangent_length = math.sqrt(
-            tangent.x * tangent.x + tangent.y * tangent.y
+            tangent_x * tangent_x + tangent_y * tangent_y
         )
 
         if tangent_length < 1e-10:
             return
 
-        tangent = Vector(tangent.x / tangent_length, tangent.y / tangent_length)
+        tangent_x = tangent_x / tangent_length
+        tangent_y = tangent_y / tangent_length
 
-        r1_cross_t = r1.x * tangent.y - r1.y * tangent.x
-        r2_cross_t = r2.x * tangent.y - r2.y * tangent.x
+        r1_cross_t = r1_x * tangent_y - r1_y * tangent_x
+        r2_cross_t = r2_x * tangent_y - r2_y * tangent_x
 
         inv_mass_sum_tangent = (
             b1.inv_mass
@@ -494,7 +581,7 @@ class Collision_Handler:
         if inv_mass_sum_tangent == 0:
             return
 
-        vel_along_tangent = rel_vel.x * tangent.x + rel_vel.y * tangent.y
+        vel_along_tangent = rel_vel_x * tangent_x + rel_vel_y * tangent_y
 
         jt = -vel_along_tangent / inv_mass_sum_tangent
 
@@ -504,16 +591,17 @@ class Collision_Handler:
         elif jt < -max_friction:
             jt = -max_friction
 
-        friction_impulse = Vector(tangent.x * jt, tangent.y * jt)
+        friction_impulse_x = tangent_x * jt
+        friction_impulse_y = tangent_y * jt
 
-        b1.velocity.x -= friction_impulse.x * b1.inv_mass
-        b1.velocity.y -= friction_impulse.y * b1.inv_mass
-        b2.velocity.x += friction_impulse.x * b2.inv_mass
-        b2.velocity.y += friction_impulse.y * b2.inv_mass
+        b1.velocity.x -= friction_impulse_x * b1.inv_mass
+        b1.velocity.y -= friction_impulse_y * b1.inv_mass
+        b2.velocity.x += friction_impulse_x * b2.inv_mass
+        b2.velocity.y += friction_impulse_y * b2.inv_mass
 
         b1.ang_velocity -= (
-            r1.x * friction_impulse.y - r1.y * friction_impulse.x
+            r1_x * friction_impulse_y - r1_y * friction_impulse_x
         ) * b1.inv_moi
         b2.ang_velocity += (
-            r2.x * friction_impulse.y - r2.y * friction_impulse.x
+            r2_x * friction_impulse_y - r2_y * friction_impulse_x
         ) * b2.inv_moi
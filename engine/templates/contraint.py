@@ -1,6 +1,5 @@
 from engine.templates.vector import Vector
 from engine.templates.body import Body
-from engine.utils.helper import cross
 import math
 
 
@@ -25,10 +24,29 @@ class Contraint:
         return world_a, world_b
 
     def solve(self):
-        world_a, world_b = self.get_world_anchors()
-
-        dist = Vector(world_b.x - world_a.x, world_b.y - world_a.y)
-        mod_dist = dist.length()
+        # same position-then-velocity projection as before, written on
+        # scalars so a relaxation pass allocates no Vectors
+        body_a = self.body_a
+        body_b = self.body_b
+        pos_a = body_a.position
+        pos_b = body_b.position
+        lax, lay = self.local_a.x, self.local_a.y
+        lbx, lby = self.local_b.x, self.local_b.y
+        inv_mass_a, inv_moi_a = body_a.inv_mass, body_a.inv_moi
+        inv_mass_b, inv_moi_b = body_b.inv_mass, body_b.inv_moi
+
+        cos_a = math.cos(body_a.orientation)
+        sin_a = math.sin(body_a.orientation)
+        cos_b = math.cos(body_b.orientation)
+        sin_b = math.sin(body_b.orientation)
+        rax = lax * cos_a - lay * sin_a
+        ray = lax * sin_a + lay * cos_a
+        rbx = lbx * cos_b - lby * sin_b
+        rby = lbx * sin_b + lby * cos_b
+
+        dx = (pos_b.x + rbx) - (pos_a.x + rax)
+        dy = (pos_b.y + rby) - (pos_a.y + ray)
+        mod_dist = math.sqrt(dx * dx + dy * dy)
         if mod_dist == 0:
             return self
 
@@ -36,78 +54,79 @@ class Contraint:
         if abs(err) < 1e-6:
             return self
 
-        n = Vector(dist.x / mod_dist, dist.y / mod_dist)
-
-        r_a = Vector(world_a.x - self.body_a.position.x, world_a.y - self.body_a.position.y)
-        r_b = Vector(world_b.x - self.body_b.position.x, world_b.y - self.body_b.position.y)
+        nx = dx / mod_dist
+        ny = dy / mod_dist
 
-        r_a_cross_n = cross(r_a, n)
-        r_b_cross_n = cross(r_b, n)
+        r_a_cross_n = rax * ny - ray * nx
+        r_b_cross_n = rbx * ny - rby * nx
 
-        w_a = self.body_a.inv_mass + self.body_a.inv_moi * r_a_cross_n * r_a_cross_n
-        w_b = self.body_b.inv_mass + self.body_b.inv_moi * r_b_cross_n * r_b_cross_n
+        w_a = inv_mass_a + inv_moi_a * r_a_cross_n * r_a_cross_n
+        w_b = inv_mass_b + inv_moi_b * r_b_cross_n * r_b_cross_n
 
         total_w = w_a + w_b
         if total_w == 0:
             return self
 
         lam = err / total_w
-
-        impulse = Vector(n.x * lam, n.y * lam)
-
-        self.body_a.position.x += impulse.x * self.body_a.inv_mass
-        self.body_a.position.y += impulse.y * self.body_a.inv_mass
-        self.body_a.orientation += self.body_a.inv_moi * cross(r_a, impulse)
-
-        self.body_b.position.x -= impulse.x * self.body_b.inv_mass
-        self.body_b.position.y -= impulse.y * self.body_b.inv_mass
-        self.body_b.orientation -= self.body_b.inv_moi * cross(r_b, impulse)
-
-        world_a, world_b = self.get_world_anchors()
-        dist = Vector(world_b.x - world_a.x, world_b.y - world_a.y)
-        mod_dist = dist.length()
+        ix = nx * lam
+        iy = ny * lam
+
+        pos_a.x += ix * inv_mass_a
+        pos_a.y += iy * inv_mass_a
+        body_a.orientation += inv_moi_a * (rax * iy - ray * ix)
+
+        pos_b.x -= ix * inv_mass_b
+        pos_b.y -= iy * inv_mass_b
+        body_b.orientation -= inv_moi_b * (rbx * iy - rby * ix)
+
+        cos_a = math.cos(body_a.orientation)
+        sin_a = math.sin(body_a.orientation)
+        cos_b = math.cos(body_b.orientation)
+        sin_b = math.sin(body_b.orientation)
+        rax = lax * cos_a - lay * sin_a
+        ray = lax * sin_a + lay * cos_a
+        rbx = lbx * cos_b - lby * sin_b
+        rby = lbx * sin_b + lby * cos_b
+
+        dx = (pos_b.x + rbx) - (pos_a.x + rax)
+        dy = (pos_b.y + rby) - (pos_a.y + ray)
+        mod_dist = math.sqrt(dx * dx + dy * dy)
         if mod_dist == 0:
             return self
 
-        err = mod_dist - self.length
-        n = Vector(dist.x / mod_dist, dist.y / mod_dist)
-
-        r_a = Vector(world_a.x - self.body_a.position.x, world_a.y - self.body_a.position.y)
-        r_b = Vector(world_b.x - self.body_b.position.x, world_b.y - self.body_b.position.y)
-
-        v_a = Vector(
-            self.body_a.velocity.x - self.body_a.ang_velocity * r_a.y,
-            self.body_a.velocity.y + self.body_a.ang_velocity * r_a.x
-        )
-        v_b = Vector(
-            self.body_b.velocity.x - self.body_b.ang_velocity * r_b.y,
-            self.body_b.velocity.y + self.body_b.ang_velocity * r_b.x
-        )
+        nx = dx / mod_dist
+        ny = dy / mod_dist
 
-        v_rel = Vector(v_b.x - v_a.x, v_b.y - v_a.y)
-        v_n = v_rel.dot(n)
+        vel_a = body_a.velocity
+        vel_b = body_b.velocity
+        ang_a = body_a.ang_velocity
+        ang_b = body_b.ang_velocity
+        v_rel_x = (vel_b.x - ang_b * rby) - (vel_a.x - ang_a * ray)
+        v_rel_y = (vel_b.y + ang_b * rbx) - (vel_a.y + ang_a * rax)
+        v_n = v_rel_x * nx + v_rel_y * ny
 
         if abs(v_n) < 1e-6:
             return self
 
-        r_a_cross_n = cross(r_a, n)
-        r_b_cross_n = cross(r_b, n)
-        w_a = self.body_a.inv_mass + self.body_a.inv_moi * r_a_cross_n * r_a_cross_n
-        w_b = self.body_b.inv_mass + self.body_b.inv_moi * r_b_cross_n * r_b_cross_n
+        r_a_cross_n = rax * ny - ray * nx
+        r_b_cross_n = rbx * ny - rby * nx
+        w_a = inv_mass_a + inv_moi_a * r_a_cross_n * r_a_cross_n
+        w_b = inv_mass_b + inv_moi_b * r_b_cross_n * r_b_cross_n
         total_w = w_a + w_b
 
         if total_w == 0:
             return self
 
         lam_v = v_n / total_w
-        impulse_v = Vector(n.x * lam_v, n.y * lam_v)
+        ix = nx * lam_v
+        iy = ny * lam_v
 
-        self.body_a.velocity.x += impulse_v.x * self.body_a.inv_mass
-        self.body_a.velocity.y += impulse_v.y * self.body_a.inv_mass
-        self.body_a.ang_velocity += self.body_a.inv_moi * cross(r_a, impulse_v)
+        vel_a.x += ix * inv_mass_a
+        vel_a.y += iy * inv_mass_a
+        body_a.ang_velocity += inv_moi_a * (rax * iy - ray * ix)
 
-        self.body_b.velocity.x -= impulse_v.x * self.body_b.inv_mass
-        self.body_b.velocity.y -= impulse_v.y * self.body_b.inv_mass
-        self.body_b.ang_velocity -= self.body_b.inv_moi * cross(r_b, impulse_v)
+        vel_b.x -= ix * inv_mass_b
+        vel_b.y -= iy * inv_mass_b
+        body_b.ang_velocity -= inv_moi_b * (rbx * iy - rby * ix)
 
         return self
@@ -7,6 +7,21 @@ from typing import Literal
 
 
 class Joint:
+    __slots__ = (
+        "radius",
+        "position",
+        "velocity",
+        "mass",
+        "inv_mass",
+        "total_force",
+        "ang_velocity",
+        "orientation",
+        "moi",
+        "inv_moi",
+        "total_torque",
+        "constraints",
+    )
+
     def __init__(
         self,
         mass: float = 0.0,
@@ -73,15 +88,18 @@ class Joint:
         return ((v2.x - v1.x) ** 2 + (v2.y - v1.y) ** 2) ** 0.5
 
     def integrate(self, dt):
-        a = Vector(
-            self.total_force.x * self.inv_mass,
-            self.total_force.y * self.inv_mass,
-        )
-        self.velocity.add(Vector(a.x * dt, a.y * dt))
-        self.position.add(Vector(self.velocity.x * dt, self.velocity.y * dt))
+        force = self.total_force
+        velocity = self.velocity
+        position = self.position
+        inv_mass = self.inv_mass
+        velocity.x += force.x * inv_mass * dt
+        velocity.y += force.y * inv_mass * dt
+        position.x += velocity.x * dt
+        position.y += velocity.y * dt
 
         ang_a = self.total_torque * self.inv_moi
         self.ang_velocity = self.ang_velocity + ang_a * dt
         self.orientation += self.ang_velocity * dt
         self.total_torque = 0.0
-        self.total_force = Vector(0, 0)
+        force.x = 0
+        force.y = 0
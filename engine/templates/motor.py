@@ -1,7 +1,7 @@
 from engine.templates.vector import Vector
 from engine.templates.body import Body
 from engine.templates.joint import Joint
-from engine.utils.helper import clamp, normalize_angle
+from engine.utils.helper import normalize_angle
 import math
 
 class Motor:
@@ -30,12 +30,19 @@ class Motor:
 
     
     def update(self, target_angle: float):
+        # runs per motor every step: fields are read into locals and the
+        # torque pair is written straight to the bodies
+        b1 = self.b1
+        b2 = self.b2
+        if not b1.inv_moi and not b2.inv_moi:
+            # neither body can turn, so the torque would never be used
+            return
         target_angle = normalize_angle(target_angle)
 
         rel_angle = normalize_angle(
-            (self.b2.orientation - self.b1.orientation) - self.rest_angle
+            (b2.orientation - b1.orientation) - self.rest_angle
         )
-        rel_ang_vel = self.b2.ang_velocity - self.b1.ang_velocity
+        rel_ang_vel = b2.ang_velocity - b1.ang_velocity
 
         motor_error = normalize_angle(target_angle - rel_angle)
         motor_torque = self.kp_motor * motor_error - self.kd_motor * rel_ang_vel
@@ -51,7 +58,11 @@ class Motor:
             limit_torque = self.kp_limit * limit_error - self.kd_limit * rel_ang_vel
 
         torque = motor_torque + limit_torque
-        torque = clamp(torque, -self.max_torque, self.max_torque)
+        max_torque = self.max_torque
+        if torque < -max_torque:
+            torque = -max_torque
+        elif torque > max_torque:
+            torque = max_torque
 
-        self.b1.apply_torque(-torque)
-        self.b2.apply_torque(torque)
+        b1.total_torque += -torque
+        b2.total_torque += torque
@@ -0,0 +1,54 @@
+import math
+
+
+class SpatialHash:
+    # objects spanning more cells than this go in a list checked on every query
+    MAX_CELLS = 64
+
+    def __init__(self, cell_size: float = 64.0):
+        self.cell_size = cell_size
+        self.inv_cell = 1.0 / cell_size
+        self.cells = {}
+        self.large = []
+
+    def clear(self):
+        self.cells = {}
+        self.large = []
+
+    def insert(self, order: int, obj, min_x: float, min_y: float, max_x: float, max_y: float):
+        entry = (order, obj)
+        if not (
+            math.isfinite(min_x)
+            and math.isfinite(min_y)
+            and math.isfinite(max_x)
+            and math.isfinite(max_y)
+        ):
+            self.large.append(entry)
+            return
+
+        inv = self.inv_cell
+        x0 = math.floor(min_x * inv)
+        y0 = math.floor(min_y * inv)
+        x1 = math.floor(max_x * inv)
+        y1 = math.floor(max_y * inv)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS:
+            self.large.append(entry)
+            return
+
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                key = (cx, cy)
+                bucket = cells.get(key)
+                if bucket is None:
+                    cells[key] = [entry]
+                else:
+                    bucket.append(entry)
+
+    def query(self, x: float, y: float) -> list:
+        # candidates whose box covers (x, y), highest order first
+        inv = self.inv_cell
+        bucket = self.cells.get((math.floor(x * inv), math.floor(y * inv)), ())
+        if self.large:
+            return sorted([*bucket, *self.large], key=lambda e: e[0], reverse=True)
+        return bucket[::-1]
@@ -2,6 +2,8 @@ from engine.templates.vector import Vector
 
 import math
 
+TWO_PI = 2 * math.pi
+
 def mul(v1: Vector, v2: Vector) -> Vector:
     return Vector(v1.x * v2.x, v1.y * v2.y)
 
@@ -40,8 +42,5 @@ def clamp(val,min,max):
         return val
     
 def normalize_angle(angle):
-    while angle > math.pi:
-        angle -= 2 * math.pi
-    while angle <= -math.pi:
-        angle += 2 * math.pi
-    return angle
\ No newline at end of file
+    angle = math.remainder(angle, TWO_PI)
+    return math.pi if angle == -math.pi else angle
\ No newline at end of file
@@ -1,7 +1,6 @@
 from simulation import SimulationEngine, load_templates
 from engine.templates.vector import Vector
 import pygame
-from vizualize import SimulationUI
 import argparse
 import math
 
@@ -20,6 +19,7 @@ class Human:
         self.engine = SimulationEngine(self.width, self.height)
         self._load_bipedal()
         self.motors = self.engine.motors
+        self._initial_state = self._capture_state()
         self.ui = None
         if not self.headless:
             self._init_ui()
@@ -45,10 +45,14 @@ class Human:
         self.engine.load_template(template_data)
 
     def _init_ui(self):
+        # vizualize initialises pygame and loads fonts at import time, so it
+        # is only imported once a window is actually wanted
+        from vizualize import SimulationUI
+
         pygame.init()
         self.ui = SimulationUI(self.engine)
 
-    def set_activations(self, activations: list) -> dict:
+    def actuate(self, activations: list):
         num_motors = len(self.motors)
         if len(activations) != num_motors:
             raise ValueError(
@@ -63,9 +67,13 @@ class Human:
             target_angle = min_a + clamped * (max_a - min_a)
             motor.set_target_angle(target_angle)
 
+    def set_activations(self, activations: list) -> dict:
+        self.actuate(activations)
+
+        com = self.get_center_of_mass()
         return {
-            "x": self.get_center_of_mass()[0],
-            "y": self.get_center_of_mass()[1],
+            "x": com[0],
+            "y": com[1],
             "target_angles": [m.target_angle for m in self.motors],
         }
 
@@ -74,8 +82,9 @@ class Human:
         weighted_x = 0.0
         weighted_y = 0.0
 
+        ground = self.engine.ground
         for box in self.engine.boxes:
-            if box == self.engine.ground:
+            if box is ground:
                 continue
 
             mass = box.body.mass
@@ -90,8 +99,9 @@ class Human:
 
     def get_boxes_positions(self) -> list:
         positions = []
+        ground = self.engine.ground
         for box in self.engine.boxes:
-            if box == self.engine.ground:
+            if box is ground:
                 continue
             positions.append(
                 {
@@ -119,12 +129,15 @@ class Human:
             )
         return positions
 
-    def step(self, dt: float = 1 / 60) -> dict:
+    def advance(self, dt: float = 1 / 60):
         if not self.engine.running:
             self.engine.start()
 
         self.engine.update(dt)
 
+    def step(self, dt: float = 1 / 60) -> dict:
+        self.advance(dt)
+
         com = self.get_center_of_mass()
         return {
             "center_of_mass": {"x": com[0], "y": com[1]},
@@ -133,10 +146,74 @@ class Human:
             "motor_target_angles": [m.target_angle for m in self.motors],
         }
 
+    def _physics_bodies(self):
+        engine = self.engine
+        return (
+            [bob.body for bob in engine.bobs]
+            + [box.body for box in engine.boxes]
+            + [joint.joint for joint in engine.joints]
+        )
+
+    def _layout(self):
+        engine = self.engine
+        return (
+            self._physics_bodies(),
+            list(engine.rods),
+            list(engine.motors),
+            list(engine.actuators),
+        )
+
+    def _capture_state(self) -> dict:
+        return {
+            "layout": self._layout(),
+            "bodies": [
+                (
+                    body.position.x,
+                    body.position.y,
+                    body.velocity.x,
+                    body.velocity.y,
+                    body.orientation,
+                    body.ang_velocity,
+                )
+                for body in self._physics_bodies()
+            ],
+            "motors": [m.target_angle for m in self.motors],
+            "actuators": [
+                (a.activation, a.target_activation) for a in self.engine.actuators
+            ],
+        }
+
     def reset(self):
-        self.engine.clear()
-        self._load_bipedal()
-        self.motors = self.engine.motors
+        # restore the pose captured after loading the template instead of
+        # clearing the engine and re-reading templates.json; if the scene
+        # was edited since (objects added or removed), rebuild it instead
+        state = self._initial_state
+        if self._layout() != state["layout"]:
+            self.engine.clear()
+            self._load_bipedal()
+            self.motors = self.engine.motors
+            self._initial_state = self._capture_state()
+            return
+        self.engine.stop()
+        self.engine.invalidate_picking()
+        for body, (px, py, vx, vy, ori, ang_vel) in zip(
+            self._physics_bodies(), state["bodies"]
+        ):
+            body.position.x = px
+            body.position.y = py
+            body.velocity.x = vx
+            body.velocity.y = vy
+            body.orientation = ori
+            body.ang_velocity = ang_vel
+            body.total_force = Vector(0, 0)
+            body.total_torque = 0.0
+        for motor, target_angle in zip(self.motors, state["motors"]):
+            motor.target_angle = target_angle
+        for actuator, (activation, target) in zip(
+            self.engine.actuators, state["actuators"]
+        ):
+            actuator.activation = activation
+            actuator.target_activation = target
 
     def start(self):
         self.engine.start()
@@ -156,6 +233,7 @@ class Human:
 
         initial_com_x = self.get_center_of_mass()[0]
         score_font = pygame.font.SysFont("SF Mono", 24, bold=True)
+        last_score_text = None
         num_motors = len(self.motors)
 
         while running:
@@ -175,7 +253,7 @@ class Human:
                         activations.append(0.8 if phase < 0.5 else 0.2)
                     else:
                         activations.append(0.2 if phase < 0.5 else 0.8)
-                self.set_activations(activations)
+                self.actuate(activations)
                 frame += 1
 
             current_com_x = self.get_center_of_mass()[0]
@@ -188,15 +266,19 @@ class Human:
             distance_traveled = current_com_x - initial_com_x
 
             score_text = f"Distance: {distance_traveled:.1f} px"
-            score_surface = score_font.render(score_text, True, (80, 200, 120))
-            score_bg = pygame.Surface(
-                (
-                    score_surface.get_width() + 20,
-                    score_surface.get_height() + 10,
-                ),
-                pygame.SRCALPHA,
-            )
-            score_bg.fill((28, 28, 36, 220))
+            if score_text != last_score_text:
+                last_score_text = score_text
+                score_surface = score_font.render(
+                    score_text, True, (80, 200, 120)
+                )
+                score_bg = pygame.Surface(
+                    (
+                        score_surface.get_width() + 20,
+                        score_surface.get_height() + 10,
+                    ),
+                    pygame.SRCALPHA,
+                )
+                score_bg.fill((28, 28, 36, 220))
             self.ui.screen.blit(score_bg, (20, 70))
             self.ui.screen.blit(score_surface, (30, 75))
 
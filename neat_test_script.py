@@ -7,22 +7,78 @@ import termios
 import time
 import pygame
 import pickle
-from human import Human
-from neural_inputs import input_vec
 import math
+import multiprocessing
+from human import Human
+from neural_inputs import input_vec, normalize_angle, N_FEATURES
 
 SIMULATION_STEPS = 100
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "neat_config.txt")
 CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), "best_genome_v0.pkl")
 
-NUM_INPUTS = 14
+NUM_INPUTS = N_FEATURES
 NUM_OUTPUTS = 4
+NUM_WORKERS = multiprocessing.cpu_count()
+
+# one walker per process, reset between genomes instead of rebuilt
+_human = None
+
+
+def get_human():
+    global _human
+    if _human is None:
+        _human = Human(headless=True)
+    else:
+        _human.reset()
+    return _human
+
 
 def check_key():
     if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
         return sys.stdin.read(1)
     return None
 
+# straight-line version of a FeedForwardNetwork: node order, weights, biases
+# and responses are fixed per genome, so they are baked into generated code
+# instead of being walked through dicts on every activate() call. the net's
+# own aggregation/activation functions are used, so outputs are identical
+class CompiledNet:
+    def __init__(self, net):
+        env = {}
+        names = {}
+
+        def const(value):
+            if math.isfinite(value):
+                return repr(float(value))
+            env[f"c{len(env)}"] = value
+            return f"c{len(env) - 1}"
+
+        inputs = []
+        for i, key in enumerate(net.input_nodes):
+            names[key] = f"i{i}"
+            inputs.append(f"i{i}")
+        for key in net.output_nodes:
+            names.setdefault(key, "0.0")
+
+        lines = ["def activate(inputs):", f"    {', '.join(inputs)}, = inputs"]
+        for n, (node, act_func, agg_func, bias, response, links) in enumerate(
+            net.node_evals
+        ):
+            env[f"act{n}"] = act_func
+            env[f"agg{n}"] = agg_func
+            terms = ", ".join(f"{names[i]} * {const(w)}" for i, w in links)
+            lines.append(
+                f"    v{n} = act{n}({const(bias)} + {const(response)} * agg{n}([{terms}]))"
+            )
+            names[node] = f"v{n}"
+        lines.append(
+            f"    return [{', '.join(names[key] for key in net.output_nodes)}]"
+        )
+
+        exec("\n".join(lines), env)
+        self.activate = env["activate"]
+
+
 def compute_activations(net, human):
     inputs = input_vec(human)
     outputs = net.activate(inputs)
@@ -30,55 +86,64 @@ def compute_activations(net, human):
     return inputs, activations
 
 def simulation_step(human, activations):
-    human.set_activations(activations)
-    human.step()
+    human.actuate(activations)
+    human.advance()
+
+def posture_fitness(upright_steps, tilted_steps, contact_steps, fallen_steps):
+    # +200 per standing step, +/-100 for torso tilt, +5 for double support,
+    # -20 per step with the torso below standing height
+    return (
+        300.0 * upright_steps
+        + 100.0 * tilted_steps
+        + 5.0 * contact_steps
+        - 20.0 * fallen_steps
+    )
+
 
 def eval_genome(genome, config):
-    net = neat.nn.FeedForwardNetwork.create(genome, config)
-    human = Human(headless=True)
+    net = CompiledNet(neat.nn.FeedForwardNetwork.create(genome, config))
+    human = get_human()
     human.start()
 
     # bipedal_v2: torso is box index 4
     TORSO_IDX = 4
-    torso = human.engine.boxes[TORSO_IDX]
-    prev_x = torso.body.position.x
-    fitness = 0.0
+    torso_body = human.engine.boxes[TORSO_IDX].body
+    upright_steps = 0
+    tilted_steps = 0
+    contact_steps = 0
+    fallen_steps = 0
     effort_penalty = 0.0
 
     for _ in range(SIMULATION_STEPS):
         inputs, activations = compute_activations(net, human)
-        # Foot contacts are at indices 12 and 13 in the input vector
-        left_foot_contact = inputs[12]
-        right_foot_contact = inputs[13]
 
         simulation_step(human, activations)
 
-        y = torso.body.position.y
-        torso_angle = torso.body.orientation
+        y = torso_body.position.y
 
         if y > 750:
-            return fitness - 500.0
-
-        curr_x = torso.body.position.x
-        dx = curr_x - prev_x
-        prev_x = curr_x
+            return posture_fitness(
+                upright_steps, tilted_steps, contact_steps, fallen_steps
+            ) - 500.0
 
         if y <= 480:
-            fitness += 200.0
-
-            normalized_angle = math.atan2(math.sin(torso_angle), math.cos(torso_angle))
-            if -0.25 <= normalized_angle <= 0.25:
-                fitness += 100.0
+            if -0.25 <= normalize_angle(torso_body.orientation) <= 0.25:
+                upright_steps += 1
             else:
-                fitness -= 100.0
+                tilted_steps += 1
 
-            if left_foot_contact > 0.0 and right_foot_contact > 0.0:
-                fitness += 5.0
+            # Foot contacts are at indices 12 and 13 in the input vector
+            if inputs[12] > 0.0 and inputs[13] > 0.0:
+                contact_steps += 1
         else:
-            fitness -= 20.0
+            fallen_steps += 1
 
-        effort_penalty += sum(abs(a - 0.5) for a in activations)
+        for a in activations:
+            effort_penalty += abs(a - 0.5)
 
+    fitness = posture_fitness(
+        upright_steps, tilted_steps, contact_steps, fallen_steps
+    )
     return fitness - 0.01 * effort_penalty
 
 
@@ -95,6 +160,7 @@ def run_best_with_ui(genome, config):
     human.start()
     initial_x = human.get_center_of_mass()[0]
     score_font = pygame.font.SysFont("SF Mono", 24, bold=True)
+    last_score_text = None
     running = True
     while running:
         dt = human.ui.tick()
@@ -108,7 +174,7 @@ def run_best_with_ui(genome, config):
                 human.ui.handle_event(event)
         
         inputs, activations = compute_activations(net, human)
-        human.set_activations(activations)
+        human.actuate(activations)
         
         current_x = human.get_center_of_mass()[0]
         target_camera_x = current_x - human.width / 2
@@ -117,12 +183,14 @@ def run_best_with_ui(genome, config):
         human.ui.draw(human.ui.screen)
         distance = current_x - initial_x
         score_text = f"Distance: {distance:.1f} px | Fitness: {genome.fitness:.1f}"
-        score_surface = score_font.render(score_text, True, (80, 200, 120))
-        score_bg = pygame.Surface(
-            (score_surface.get_width() + 20, score_surface.get_height() + 10),
-            pygame.SRCALPHA,
-        )
-        score_bg.fill((28, 28, 36, 220))
+        if score_text != last_score_text:
+            last_score_text = score_text
+            score_surface = score_font.render(score_text, True, (80, 200, 120))
+            score_bg = pygame.Surface(
+                (score_surface.get_width() + 20, score_surface.get_height() + 10),
+                pygame.SRCALPHA,
+            )
+            score_bg.fill((28, 28, 36, 220))
         human.ui.screen.blit(score_bg, (20, 70))
         human.ui.screen.blit(score_surface, (30, 75))
         pygame.display.flip()
@@ -153,12 +221,18 @@ def run(start_fresh=True):
     stats = neat.StatisticsReporter()
     pop.add_reporter(stats)
     
+    if NUM_WORKERS > 1:
+        evaluator = neat.ParallelEvaluator(NUM_WORKERS, eval_genome)
+        evaluate = evaluator.evaluate
+    else:
+        evaluate = eval_genomes
+
     best = None
     old_settings = termios.tcgetattr(sys.stdin)
     try:
         tty.setcbreak(sys.stdin.fileno())
         while True:
-            best = pop.run(eval_genomes, 1)
+            best = pop.run(evaluate, 1)
             print(f"\nGeneration {generation} complete. Best fitness: {best.fitness:.2f}")
             print("Press 1 to view best genome with UI...")
             
@@ -184,6 +258,10 @@ def run(start_fresh=True):
         print(f"Checkpoint saved to {CHECKPOINT_PATH}")
     finally:
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+        if NUM_WORKERS > 1:
+            # Ctrl+C also reaches the workers mid-map; close() and join() in
+            # the evaluator's __del__ would then wait on tasks that were lost
+            evaluator.pool.terminate()
 
 
 if __name__ == "__main__":
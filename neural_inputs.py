@@ -4,6 +4,12 @@ from human import Human
 MAX_ANG_VEL = 15.0
 MAX_TORSO_VEL = 10.0
 MAX_JOINT_ANGLE = math.pi
+TWO_PI = 2 * math.pi
+
+INV_PI = 1.0 / math.pi
+INV_ANG_VEL = 1.0 / MAX_ANG_VEL
+INV_TORSO_VEL = 1.0 / MAX_TORSO_VEL
+INV_JOINT_ANGLE = 1.0 / MAX_JOINT_ANGLE
 
 TORSO_IDX = 4
 LEFT_THIGH_IDX = 0
@@ -11,17 +17,15 @@ LEFT_SHIN_IDX = 1
 RIGHT_SHIN_IDX = 2
 RIGHT_THIGH_IDX = 3
 
+N_FEATURES = 14
+
 
 def clamp(val: float, lo: float = -1.0, hi: float = 1.0) -> float:
-    return max(lo, min(hi, val))
+    return lo if val < lo else (hi if val > hi else val)
 
 
 def normalize_angle(angle: float) -> float:
-    while angle > math.pi:
-        angle -= 2 * math.pi
-    while angle < -math.pi:
-        angle += 2 * math.pi
-    return angle
+    return math.remainder(angle, TWO_PI)
 
 
 def torso_angle(human: Human) -> float:
@@ -67,32 +71,33 @@ def foot_contact(human: Human, shin_idx: int) -> float:
 
 
 def input_vec(human: Human) -> list:
-    inputs = []
-    
-    
-    inputs.append(torso_angle(human) / math.pi)
-    inputs.append(clamp(torso_ang_vel(human) / MAX_ANG_VEL))
-    inputs.append(clamp(torso_vel_x(human) / MAX_TORSO_VEL))
-    inputs.append(clamp(torso_vel_y(human) / MAX_TORSO_VEL))
-    
-    
-    inputs.append(joint_angle_between(human, TORSO_IDX, LEFT_THIGH_IDX) / MAX_JOINT_ANGLE)
-    inputs.append(clamp(joint_ang_vel_between(human, TORSO_IDX, LEFT_THIGH_IDX) / MAX_ANG_VEL))
-    
-    
-    inputs.append(joint_angle_between(human, LEFT_THIGH_IDX, LEFT_SHIN_IDX) / MAX_JOINT_ANGLE)
-    inputs.append(clamp(joint_ang_vel_between(human, LEFT_THIGH_IDX, LEFT_SHIN_IDX) / MAX_ANG_VEL))
-    
-    
-    inputs.append(joint_angle_between(human, TORSO_IDX, RIGHT_THIGH_IDX) / MAX_JOINT_ANGLE)
-    inputs.append(clamp(joint_ang_vel_between(human, TORSO_IDX, RIGHT_THIGH_IDX) / MAX_ANG_VEL))
-    
-    
-    inputs.append(joint_angle_between(human, RIGHT_THIGH_IDX, RIGHT_SHIN_IDX) / MAX_JOINT_ANGLE)
-    inputs.append(clamp(joint_ang_vel_between(human, RIGHT_THIGH_IDX, RIGHT_SHIN_IDX) / MAX_ANG_VEL))
-    
-    
-    inputs.append(foot_contact(human, LEFT_SHIN_IDX))
-    inputs.append(foot_contact(human, RIGHT_SHIN_IDX))
-    
-    return inputs
+    boxes = human.engine.boxes
+    tb = boxes[TORSO_IDX].body
+    ltb = boxes[LEFT_THIGH_IDX].body
+    lsb = boxes[LEFT_SHIN_IDX].body
+    rtb = boxes[RIGHT_THIGH_IDX].body
+    rsb = boxes[RIGHT_SHIN_IDX].body
+
+    t_ori = tb.orientation
+    t_angv = tb.ang_velocity
+    lt_ori = ltb.orientation
+    lt_angv = ltb.ang_velocity
+    rt_ori = rtb.orientation
+    rt_angv = rtb.ang_velocity
+
+    return [
+        t_ori * INV_PI,
+        clamp(t_angv * INV_ANG_VEL),
+        clamp(tb.velocity.x * INV_TORSO_VEL),
+        clamp(tb.velocity.y * INV_TORSO_VEL),
+        normalize_angle(lt_ori - t_ori) * INV_JOINT_ANGLE,
+        clamp((lt_angv - t_angv) * INV_ANG_VEL),
+        normalize_angle(lsb.orientation - lt_ori) * INV_JOINT_ANGLE,
+        clamp((lsb.ang_velocity - lt_angv) * INV_ANG_VEL),
+        normalize_angle(rt_ori - t_ori) * INV_JOINT_ANGLE,
+        clamp((rt_angv - t_angv) * INV_ANG_VEL),
+        normalize_angle(rsb.orientation - rt_ori) * INV_JOINT_ANGLE,
+        clamp((rsb.ang_velocity - rt_angv) * INV_ANG_VEL),
+        foot_contact(human, LEFT_SHIN_IDX),
+        foot_contact(human, RIGHT_SHIN_IDX),
+    ]
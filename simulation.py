@@ -8,17 +8,81 @@ from engine.templates.collision_handler import Collision_Handler
 from engine.templates.actuator import Actuator
 from engine.templates.joint import Joint
 from engine.templates.motor import Motor
+from engine.templates.spatial_hash import SpatialHash
 
 TEMPLATES_FILE = os.path.join(os.path.dirname(__file__), "templates.json")
 
 BOB_RADIUS = 10
 BOX_WIDTH = 15
 BOX_HEIGHT = 80
-GRAVITY = Vector(0, 980)
+GRAVITY_X = 0.0
+GRAVITY_Y = 980.0
 FORCE_MAGNITUDE = 5000
+PICK_CELL_SIZE = 64
+REST_SPEED_SQ = 1e-4
+
+
+# property setters shared by Bob and Box, keyed like their debug info
+def _set_position_x(obj, value):
+    obj.body.position.x = float(value)
+
+
+def _set_position_y(obj, value):
+    obj.body.position.y = float(value)
+
+
+def _set_velocity_x(obj, value):
+    obj.body.velocity.x = float(value)
+
+
+def _set_velocity_y(obj, value):
+    obj.body.velocity.y = float(value)
+
+
+def _set_orientation(obj, value):
+    obj.body.orientation = float(value)
+
+
+def _set_ang_velocity(obj, value):
+    obj.body.ang_velocity = float(value)
+
+
+def _add_torque(obj, value):
+    obj.body.apply_torque(float(value))
+
+
+def _add_force_x(obj, value):
+    obj.body.total_force.x += float(value)
+
+
+def _add_force_y(obj, value):
+    obj.body.total_force.y += float(value)
+
+
+_BODY_SETTERS = {
+    "position.x": _set_position_x,
+    "position.y": _set_position_y,
+    "velocity.x": _set_velocity_x,
+    "velocity.y": _set_velocity_y,
+    "orientation": _set_orientation,
+    "ang_velocity": _set_ang_velocity,
+    "add_torque": _add_torque,
+    "add_force.x": _add_force_x,
+    "add_force.y": _add_force_y,
+}
 
 
 class Bob:
+    __slots__ = (
+        "id",
+        "radius",
+        "body",
+        "pinned",
+        "name",
+        "_pick_radius",
+        "_pick_radius_sq",
+    )
+
     _id_counter = 0
 
     def __init__(self, x, y, pinned=False):
@@ -33,11 +97,20 @@ class Bob:
         if self.pinned:
             self.body.inv_moi = 0
         self.name = f"Bob_{self.id}"
+        self._pick_radius = None
+        self._pick_radius_sq = 0
 
     def contains(self, x, y):
-        dx = x - self.body.position.x
-        dy = y - self.body.position.y
-        return (dx * dx + dy * dy) <= (self.radius + 8) ** 2
+        # radius is assigned from several places (debug panel, templates),
+        # so the squared pick radius is refreshed whenever it differs
+        radius = self.radius
+        if radius != self._pick_radius:
+            self._pick_radius = radius
+            self._pick_radius_sq = (radius + 8) ** 2
+        position = self.body.position
+        dx = x - position.x
+        dy = y - position.y
+        return (dx * dx + dy * dy) <= self._pick_radius_sq
 
     def apply_force(self, force):
         self.body.apply_force(force)
@@ -55,68 +128,81 @@ class Bob:
         self.body.clear_torque()
 
     def get_debug_info(self):
+        body = self.body
+        position = body.position
+        velocity = body.velocity
+        force = body.total_force
         return {
             "type": "Bob",
             "id": self.id,
             "name": self.name,
-            "position.x": round(self.body.position.x, 2),
-            "position.y": round(self.body.position.y, 2),
-            "velocity.x": round(self.body.velocity.x, 2),
-            "velocity.y": round(self.body.velocity.y, 2),
-            "mass": self.body.mass,
+            "position.x": round(position.x, 2),
+            "position.y": round(position.y, 2),
+            "velocity.x": round(velocity.x, 2),
+            "velocity.y": round(velocity.y, 2),
+            "mass": body.mass,
             "pinned": self.pinned,
             "radius": self.radius,
-            "force.x": round(self.body.total_force.x, 2),
-            "force.y": round(self.body.total_force.y, 2),
-            "orientation": round(self.body.orientation, 2),
-            "ang_velocity": round(self.body.ang_velocity, 2),
-            "moi": round(self.body.moi, 2),
-            "torque": round(self.body.total_torque, 2),
+            "force.x": round(force.x, 2),
+            "force.y": round(force.y, 2),
+            "orientation": round(body.orientation, 2),
+            "ang_velocity": round(body.ang_velocity, 2),
+            "moi": round(body.moi, 2),
+            "torque": round(body.total_torque, 2),
             "add_torque": 0.0,
             "add_force.x": 0.0,
             "add_force.y": 0.0,
         }
 
+    def _set_mass(self, value):
+        self.body.mass = float(value)
+        self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
+        self.pinned = self.body.mass == 0
+        self.radius = BOB_RADIUS * (self.body.mass / 5)
+        self.body.radius = self.radius
+
+    def _set_pinned(self, value):
+        self.pinned = bool(value)
+        self.body.mass = 0 if self.pinned else 1
+        self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
+        self.body.inv_moi = (
+            0
+            if self.pinned
+            else (1 / self.body.moi if self.body.moi > 0 else 0)
+        )
+
+    def _set_radius(self, value):
+        self.radius = max(5, int(value))
+        self.body.radius = self.radius
+
+    _SETTERS = {
+        **_BODY_SETTERS,
+        "mass": _set_mass,
+        "pinned": _set_pinned,
+        "radius": _set_radius,
+    }
+
     def set_property(self, key, value):
-        if key == "position.x":
-            self.body.position.x = float(value)
-        elif key == "position.y":
-            self.body.position.y = float(value)
-        elif key == "velocity.x":
-            self.body.velocity.x = float(value)
-        elif key == "velocity.y":
-            self.body.velocity.y = float(value)
-        elif key == "mass":
-            self.body.mass = float(value)
-            self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
-            self.pinned = self.body.mass == 0
-            self.radius = BOB_RADIUS * (self.body.mass / 5)
-            self.body.radius = self.radius
-        elif key == "pinned":
-            self.pinned = bool(value)
-            self.body.mass = 0 if self.pinned else 1
-            self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
-            self.body.inv_moi = (
-                0
-                if self.pinned
-                else (1 / self.body.moi if self.body.moi > 0 else 0)
-            )
-        elif key == "radius":
-            self.radius = max(5, int(value))
-            self.body.radius = self.radius
-        elif key == "orientation":
-            self.body.orientation = float(value)
-        elif key == "ang_velocity":
-            self.body.ang_velocity = float(value)
-        elif key == "add_torque":
-            self.body.apply_torque(float(value))
-        elif key == "add_force.x":
-            self.body.apply_force(Vector(float(value), 0))
-        elif key == "add_force.y":
-            self.body.apply_force(Vector(0, float(value)))
+        setter = self._SETTERS.get(key)
+        if setter is not None:
+            setter(self, value)
 
 
 class Box:
+    __slots__ = (
+        "id",
+        "width",
+        "height",
+        "body",
+        "pinned",
+        "name",
+        "_trig_orientation",
+        "_trig_cos",
+        "_trig_sin",
+        "_anchor_size",
+        "_local_anchors",
+    )
+
     _id_counter = 0
 
     ANCHOR_CENTER = "center"
@@ -142,47 +228,104 @@ class Box:
         if self.pinned:
             self.body.inv_moi = 0
         self.name = f"Box_{self.id}"
+        self._trig_orientation = None
+        self._trig_cos = 1.0
+        self._trig_sin = 0.0
+        self._anchor_size = None
+        self._local_anchors = None
+
+    def _trig(self):
+        # cos/sin of the current orientation; anchors, handles and picking
+        # ask for them several times between two physics steps
+        orientation = self.body.orientation
+        if orientation != self._trig_orientation:
+            self._trig_orientation = orientation
+            self._trig_cos = math.cos(orientation)
+            self._trig_sin = math.sin(orientation)
+        return self._trig_cos, self._trig_sin
 
     def get_local_anchors(self):
-        hw = self.width / 2
-        hh = self.height / 2
-        return {
-            self.ANCHOR_CENTER: Vector(0, 0),
-            self.ANCHOR_LEFT: Vector(-hw, 0),
-            self.ANCHOR_RIGHT: Vector(hw, 0),
-            self.ANCHOR_TOP: Vector(0, -hh),
-            self.ANCHOR_BOTTOM: Vector(0, hh),
-        }
+        # shared between callers (constraints keep references to these
+        # Vectors), so treat them as read-only; rebuilt when the size
+        # changes, whether through set_property, resize or a direct write
+        size = (self.width, self.height)
+        if size != self._anchor_size:
+            hw = self.width / 2
+            hh = self.height / 2
+            self._anchor_size = size
+            self._local_anchors = {
+                self.ANCHOR_CENTER: Vector(0, 0),
+                self.ANCHOR_LEFT: Vector(-hw, 0),
+                self.ANCHOR_RIGHT: Vector(hw, 0),
+                self.ANCHOR_TOP: Vector(0, -hh),
+                self.ANCHOR_BOTTOM: Vector(0, hh),
+            }
+        return self._local_anchors
+
+    def get_local_anchor(self, anchor_name):
+        # same offsets as get_local_anchors() without building all five
+        if anchor_name == self.ANCHOR_CENTER:
+            return 0, 0
+        if anchor_name == self.ANCHOR_LEFT:
+            return -self.width / 2, 0
+        if anchor_name == self.ANCHOR_RIGHT:
+            return self.width / 2, 0
+        if anchor_name == self.ANCHOR_TOP:
+            return 0, -self.height / 2
+        if anchor_name == self.ANCHOR_BOTTOM:
+            return 0, self.height / 2
+        raise KeyError(anchor_name)
 
     def get_world_anchor(self, anchor_name):
-        import math
-
-        local = self.get_local_anchors()[anchor_name]
-        cos_a = math.cos(self.body.orientation)
-        sin_a = math.sin(self.body.orientation)
-        wx = self.body.position.x + local.x * cos_a - local.y * sin_a
-        wy = self.body.position.y + local.x * sin_a + local.y * cos_a
+        lx, ly = self.get_local_anchor(anchor_name)
+        body = self.body
+        cos_a, sin_a = self._trig()
+        wx = body.position.x + lx * cos_a - ly * sin_a
+        wy = body.position.y + lx * sin_a + ly * cos_a
         return Vector(wx, wy)
 
     def get_all_world_anchors(self):
-        import math
-
-        cos_a = math.cos(self.body.orientation)
-        sin_a = math.sin(self.body.orientation)
+        # the anchors sit on the box axes, so the rotated half extents are
+        # all that is needed: four products instead of five rotations
+        cos_a, sin_a = self._trig()
         cx, cy = self.body.position.x, self.body.position.y
-        result = {}
-        for name, local in self.get_local_anchors().items():
-            wx = cx + local.x * cos_a - local.y * sin_a
-            wy = cy + local.x * sin_a + local.y * cos_a
-            result[name] = (wx, wy)
-        return result
+        hw = self.width / 2
+        hh = self.height / 2
+        wc = hw * cos_a
+        ws = hw * sin_a
+        hc = hh * cos_a
+        hs = hh * sin_a
+        return {
+            self.ANCHOR_CENTER: (cx, cy),
+            self.ANCHOR_LEFT: (cx - wc, cy - ws),
+            self.ANCHOR_RIGHT: (cx + wc, cy + ws),
+            self.ANCHOR_TOP: (cx + hs, cy - hc),
+            self.ANCHOR_BOTTOM: (cx - hs, cy + hc),
+        }
 
     def get_nearest_anchor(self, x, y):
-        anchors = self.get_all_world_anchors()
-        min_dist = float("inf")
+        # runs on every mouse move while wiring; skips the anchors dict
+        cos_a, sin_a = self._trig()
+        cx, cy = self.body.position.x, self.body.position.y
+        hw = self.width / 2
+        hh = self.height / 2
+        wc = hw * cos_a
+        ws = hw * sin_a
+        hc = hh * cos_a
+        hs = hh * sin_a
+        candidates = (
+            (self.ANCHOR_CENTER, cx, cy),
+            (self.ANCHOR_LEFT, cx - wc, cy - ws),
+            (self.ANCHOR_RIGHT, cx + wc, cy + ws),
+            (self.ANCHOR_TOP, cx + hs, cy - hc),
+            (self.ANCHOR_BOTTOM, cx - hs, cy + hc),
+        )
         nearest = self.ANCHOR_CENTER
-        for name, (ax, ay) in anchors.items():
-            dist = (x - ax) ** 2 + (y - ay) ** 2
+        min_dist = float("inf")
+        for name, ax, ay in candidates:
+            dx = x - ax
+            dy = y - ay
+            dist = dx * dx + dy * dy
             if dist < min_dist:
                 min_dist = dist
                 nearest = name
@@ -203,27 +346,40 @@ class Box:
         }
 
     def get_world_resize_handles(self):
-        cos_a = math.cos(self.body.orientation)
-        sin_a = math.sin(self.body.orientation)
+        # same shared half-extent products as get_all_world_anchors
+        cos_a, sin_a = self._trig()
         cx, cy = self.body.position.x, self.body.position.y
-        result = {}
-        for name, local in self.get_resize_handles().items():
-            wx = cx + local.x * cos_a - local.y * sin_a
-            wy = cy + local.x * sin_a + local.y * cos_a
-            result[name] = (wx, wy)
-        return result
+        hw = self.width / 2
+        hh = self.height / 2
+        wc = hw * cos_a
+        ws = hw * sin_a
+        hc = hh * cos_a
+        hs = hh * sin_a
+        return {
+            "top_left": (cx - wc + hs, cy - ws - hc),
+            "top_right": (cx + wc + hs, cy + ws - hc),
+            "bottom_left": (cx - wc - hs, cy - ws + hc),
+            "bottom_right": (cx + wc - hs, cy + ws + hc),
+            "top": (cx + hs, cy - hc),
+            "bottom": (cx - hs, cy + hc),
+            "left": (cx - wc, cy - ws),
+            "right": (cx + wc, cy + ws),
+        }
 
     def get_resize_handle_at(self, x, y, threshold=12):
         handles = self.get_world_resize_handles()
+        threshold2 = threshold * threshold
         for name, (hx, hy) in handles.items():
-            dist = ((x - hx) ** 2 + (y - hy) ** 2) ** 0.5
-            if dist < threshold:
+            dx = x - hx
+            dy = y - hy
+            if dx * dx + dy * dy < threshold2:
                 return name
         return None
 
     def resize(self, handle, world_x, world_y):
-        cos_a = math.cos(-self.body.orientation)
-        sin_a = math.sin(-self.body.orientation)
+        # inverse rotation: cos(-a) == cos(a), sin(-a) == -sin(a)
+        cos_a, sin_a = self._trig()
+        sin_a = -sin_a
         dx = world_x - self.body.position.x
         dy = world_y - self.body.position.y
         local_x = dx * cos_a - dy * sin_a
@@ -254,12 +410,11 @@ class Box:
             self.body.inv_moi = 1 / self.body.moi
 
     def contains(self, x, y):
-        import math
-
-        cos_a = math.cos(-self.body.orientation)
-        sin_a = math.sin(-self.body.orientation)
-        dx = x - self.body.position.x
-        dy = y - self.body.position.y
+        body = self.body
+        cos_a, sin_a = self._trig()
+        sin_a = -sin_a
+        dx = x - body.position.x
+        dy = y - body.position.y
         local_x = dx * cos_a - dy * sin_a
         local_y = dx * sin_a + dy * cos_a
         return (
@@ -283,67 +438,68 @@ class Box:
         self.body.clear_torque()
 
     def get_debug_info(self):
+        body = self.body
+        position = body.position
+        velocity = body.velocity
+        force = body.total_force
         return {
             "type": "Box",
             "id": self.id,
             "name": self.name,
-            "position.x": round(self.body.position.x, 2),
-            "position.y": round(self.body.position.y, 2),
-            "velocity.x": round(self.body.velocity.x, 2),
-            "velocity.y": round(self.body.velocity.y, 2),
-            "mass": self.body.mass,
+            "position.x": round(position.x, 2),
+            "position.y": round(position.y, 2),
+            "velocity.x": round(velocity.x, 2),
+            "velocity.y": round(velocity.y, 2),
+            "mass": body.mass,
             "pinned": self.pinned,
             "width": self.width,
             "height": self.height,
-            "force.x": round(self.body.total_force.x, 2),
-            "force.y": round(self.body.total_force.y, 2),
-            "orientation": round(self.body.orientation, 2),
-            "ang_velocity": round(self.body.ang_velocity, 2),
-            "moi": round(self.body.moi, 2),
-            "torque": round(self.body.total_torque, 2),
+            "force.x": round(force.x, 2),
+            "force.y": round(force.y, 2),
+            "orientation": round(body.orientation, 2),
+            "ang_velocity": round(body.ang_velocity, 2),
+            "moi": round(body.moi, 2),
+            "torque": round(body.total_torque, 2),
             "add_torque": 0.0,
             "add_force.x": 0.0,
             "add_force.y": 0.0,
         }
 
+    def _set_mass(self, value):
+        self.body.mass = float(value)
+        self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
+        self.pinned = self.body.mass == 0
+
+    def _set_pinned(self, value):
+        self.pinned = bool(value)
+        self.body.mass = 0 if self.pinned else 2
+        self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
+        self.body.inv_moi = (
+            0
+            if self.pinned
+            else (1 / self.body.moi if self.body.moi > 0 else 0)
+        )
+
+    def _set_width(self, value):
+        self.width = max(10, float(value))
+        self.body.width = self.width
+
+    def _set_height(self, value):
+        self.height = max(10, float(value))
+        self.body.height = self.height
+
+    _SETTERS = {
+        **_BODY_SETTERS,
+        "mass": _set_mass,
+        "pinned": _set_pinned,
+        "width": _set_width,
+        "height": _set_height,
+    }
+
     def set_property(self, key, value):
-        if key == "position.x":
-            self.body.position.x = float(value)
-        elif key == "position.y":
-            self.body.position.y = float(value)
-        elif key == "velocity.x":
-            self.body.velocity.x = float(value)
-        elif key == "velocity.y":
-            self.body.velocity.y = float(value)
-        elif key == "mass":
-            self.body.mass = float(value)
-            self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
-            self.pinned = self.body.mass == 0
-        elif key == "pinned":
-            self.pinned = bool(value)
-            self.body.mass = 0 if self.pinned else 2
-            self.body.inv_mass = 1 / self.body.mass if self.body.mass > 0 else 0
-            self.body.inv_moi = (
-                0
-                if self.pinned
-                else (1 / self.body.moi if self.body.moi > 0 else 0)
-            )
-        elif key == "width":
-            self.width = max(10, float(value))
-            self.body.width = self.width
-        elif key == "height":
-            self.height = max(10, float(value))
-            self.body.height = self.height
-        elif key == "orientation":
-            self.body.orientation = float(value)
-        elif key == "ang_velocity":
-            self.body.ang_velocity = float(value)
-        elif key == "add_torque":
-            self.body.apply_torque(float(value))
-        elif key == "add_force.x":
-            self.body.apply_force(Vector(float(value), 0))
-        elif key == "add_force.y":
-            self.body.apply_force(Vector(0, float(value)))
+        setter = self._SETTERS.get(key)
+        if setter is not None:
+            setter(self, value)
 
 
 JOINT_RADIUS = 8
@@ -364,11 +520,19 @@ class JointWrapper:
         )
         self.name = f"Joint_{self.id}"
         self.connected_bodies = []
+        self._pick_radius = None
+        self._pick_radius_sq = 0
 
     def contains(self, x, y):
-        dx = x - self.joint.position.x
-        dy = y - self.joint.position.y
-        return (dx * dx + dy * dy) <= (self.radius + 8) ** 2
+        # same lazily refreshed squared pick radius as Bob.contains
+        radius = self.radius
+        if radius != self._pick_radius:
+            self._pick_radius = radius
+            self._pick_radius_sq = (radius + 8) ** 2
+        position = self.joint.position
+        dx = x - position.x
+        dy = y - position.y
+        return (dx * dx + dy * dy) <= self._pick_radius_sq
 
     def connect(self, body, body_anchor=None):
         if isinstance(body, Box):
@@ -409,21 +573,39 @@ class JointWrapper:
             "connections": len(self.connected_bodies),
         }
 
+    def _set_position_x(self, value):
+        self.joint.position.x = float(value)
+
+    def _set_position_y(self, value):
+        self.joint.position.y = float(value)
+
+    def _set_velocity_x(self, value):
+        self.joint.velocity.x = float(value)
+
+    def _set_velocity_y(self, value):
+        self.joint.velocity.y = float(value)
+
+    def _set_mass(self, value):
+        self.joint.mass = float(value)
+        self.joint.inv_mass = 1 / self.joint.mass if self.joint.mass > 0 else 0
+
+    def _set_radius(self, value):
+        self.radius = max(3, int(value))
+        self.joint.radius = self.radius
+
+    _SETTERS = {
+        "position.x": _set_position_x,
+        "position.y": _set_position_y,
+        "velocity.x": _set_velocity_x,
+        "velocity.y": _set_velocity_y,
+        "mass": _set_mass,
+        "radius": _set_radius,
+    }
+
     def set_property(self, key, value):
-        if key == "position.x":
-            self.joint.position.x = float(value)
-        elif key == "position.y":
-            self.joint.position.y = float(value)
-        elif key == "velocity.x":
-            self.joint.velocity.x = float(value)
-        elif key == "velocity.y":
-            self.joint.velocity.y = float(value)
-        elif key == "mass":
-            self.joint.mass = float(value)
-            self.joint.inv_mass = 1 / self.joint.mass if self.joint.mass > 0 else 0
-        elif key == "radius":
-            self.radius = max(3, int(value))
-            self.joint.radius = self.radius
+        setter = self._SETTERS.get(key)
+        if setter is not None:
+            setter(self, value)
 
 
 class MotorWrapper:
@@ -471,19 +653,37 @@ class MotorWrapper:
             "max_torque": round(self.motor.max_torque, 2),
         }
 
+    def _set_target_angle(self, value):
+        self.target_angle = float(value)
+
+    def _set_min_angle(self, value):
+        self.motor.min_angle = float(value)
+
+    def _set_max_angle(self, value):
+        self.motor.max_angle = float(value)
+
+    def _set_kp_motor(self, value):
+        self.motor.kp_motor = max(0, float(value))
+
+    def _set_kd_motor(self, value):
+        self.motor.kd_motor = max(0, float(value))
+
+    def _set_max_torque(self, value):
+        self.motor.max_torque = max(0, float(value))
+
+    _SETTERS = {
+        "target_angle": _set_target_angle,
+        "min_angle": _set_min_angle,
+        "max_angle": _set_max_angle,
+        "kp_motor": _set_kp_motor,
+        "kd_motor": _set_kd_motor,
+        "max_torque": _set_max_torque,
+    }
+
     def set_property(self, key, value):
-        if key == "target_angle":
-            self.target_angle = float(value)
-        elif key == "min_angle":
-            self.motor.min_angle = float(value)
-        elif key == "max_angle":
-            self.motor.max_angle = float(value)
-        elif key == "kp_motor":
-            self.motor.kp_motor = max(0, float(value))
-        elif key == "kd_motor":
-            self.motor.kd_motor = max(0, float(value))
-        elif key == "max_torque":
-            self.motor.max_torque = max(0, float(value))
+        setter = self._SETTERS.get(key)
+        if setter is not None:
+            setter(self, value)
 
 
 class PointConstraint:
@@ -593,31 +793,43 @@ class BoxBobDistanceConstraint:
         return Vector(wx, wy)
 
     def solve(self):
-        world_anchor = self.get_world_anchor()
-        bob_pos = self.bob.body.position
-
-        dx = bob_pos.x - world_anchor.x
-        dy = bob_pos.y - world_anchor.y
+        # same arithmetic as the Vector-based version, on local scalars
+        box_body = self.box.body
+        bob_body = self.bob.body
+        box_pos = box_body.position
+        bob_pos = bob_body.position
+        lx = self.local_anchor.x
+        ly = self.local_anchor.y
+
+        cos_a = math.cos(box_body.orientation)
+        sin_a = math.sin(box_body.orientation)
+        wx = box_pos.x + lx * cos_a - ly * sin_a
+        wy = box_pos.y + lx * sin_a + ly * cos_a
+
+        dx = bob_pos.x - wx
+        dy = bob_pos.y - wy
         current_dist = (dx * dx + dy * dy) ** 0.5
 
         if current_dist < 0.001:
             return
 
-        err = current_dist - self.length
+        length = self.length
+        err = current_dist - length
         if abs(err) < 0.001:
             return
 
         nx = dx / current_dist
         ny = dy / current_dist
 
-        w_bob = self.bob.body.inv_mass
-        w_box = self.box.body.inv_mass
+        w_bob = bob_body.inv_mass
+        w_box = box_body.inv_mass
+        inv_moi = box_body.inv_moi
 
-        r_x = world_anchor.x - self.box.body.position.x
-        r_y = world_anchor.y - self.box.body.position.y
+        r_x = wx - box_pos.x
+        r_y = wy - box_pos.y
 
         r_cross_n = r_x * ny - r_y * nx
-        angular_mass = self.box.body.inv_moi * r_cross_n * r_cross_n
+        angular_mass = inv_moi * r_cross_n * r_cross_n
 
         eff_mass = w_bob + w_box + angular_mass
         if eff_mass <= 0:
@@ -625,32 +837,29 @@ class BoxBobDistanceConstraint:
 
         lambda_val = err / eff_mass
 
-        self.bob.body.position.x -= w_bob * lambda_val * nx
-        self.bob.body.position.y -= w_bob * lambda_val * ny
-
-        self.box.body.position.x += w_box * lambda_val * nx
-        self.box.body.position.y += w_box * lambda_val * ny
+        bob_pos.x -= w_bob * lambda_val * nx
+        bob_pos.y -= w_bob * lambda_val * ny
 
-        self.box.body.orientation += (
-            self.box.body.inv_moi * r_cross_n * lambda_val
-        )
+        box_pos.x += w_box * lambda_val * nx
+        box_pos.y += w_box * lambda_val * ny
 
-        world_anchor = self.get_world_anchor()
-        r_x = world_anchor.x - self.box.body.position.x
-        r_y = world_anchor.y - self.box.body.position.y
+        box_body.orientation += inv_moi * r_cross_n * lambda_val
 
-        box_anchor_vel_x = (
-            self.box.body.velocity.x - self.box.body.ang_velocity * r_y
-        )
-        box_anchor_vel_y = (
-            self.box.body.velocity.y + self.box.body.ang_velocity * r_x
-        )
+        cos_a = math.cos(box_body.orientation)
+        sin_a = math.sin(box_body.orientation)
+        wx = box_pos.x + lx * cos_a - ly * sin_a
+        wy = box_pos.y + lx * sin_a + ly * cos_a
+        r_x = wx - box_pos.x
+        r_y = wy - box_pos.y
 
-        rel_vel_x = self.bob.body.velocity.x - box_anchor_vel_x
-        rel_vel_y = self.bob.body.velocity.y - box_anchor_vel_y
+        box_vel = box_body.velocity
+        bob_vel = bob_body.velocity
+        ang_velocity = box_body.ang_velocity
+        rel_vel_x = bob_vel.x - (box_vel.x - ang_velocity * r_y)
+        rel_vel_y = bob_vel.y - (box_vel.y + ang_velocity * r_x)
 
-        dx = bob_pos.x - world_anchor.x
-        dy = bob_pos.y - world_anchor.y
+        dx = bob_pos.x - wx
+        dy = bob_pos.y - wy
         current_dist = (dx * dx + dy * dy) ** 0.5
         if current_dist < 0.001:
             return
@@ -660,23 +869,36 @@ class BoxBobDistanceConstraint:
 
         rel_vel_along = rel_vel_x * nx + rel_vel_y * ny
 
-        err_after = current_dist - self.length
+        err_after = current_dist - length
         if err_after * rel_vel_along > 0:
             r_cross_n = r_x * ny - r_y * nx
-            angular_mass = self.box.body.inv_moi * r_cross_n * r_cross_n
+            angular_mass = inv_moi * r_cross_n * r_cross_n
             eff_mass = w_bob + w_box + angular_mass
             if eff_mass > 0:
                 impulse = rel_vel_along / eff_mass
-                self.bob.body.velocity.x -= w_bob * impulse * nx
-                self.bob.body.velocity.y -= w_bob * impulse * ny
-                self.box.body.velocity.x += w_box * impulse * nx
-                self.box.body.velocity.y += w_box * impulse * ny
-                self.box.body.ang_velocity += (
-                    self.box.body.inv_moi * r_cross_n * impulse
-                )
+                bob_vel.x -= w_bob * impulse * nx
+                bob_vel.y -= w_bob * impulse * ny
+                box_vel.x += w_box * impulse * nx
+                box_vel.y += w_box * impulse * ny
+                box_body.ang_velocity += inv_moi * r_cross_n * impulse
 
 
 class Rod:
+    __slots__ = (
+        "id",
+        "bob1",
+        "bob2",
+        "anchor1",
+        "anchor2",
+        "constraint",
+        "point_constraint1",
+        "point_constraint2",
+        "length",
+        "name",
+        "_anchored1",
+        "_anchored2",
+    )
+
     _id_counter = 0
 
     def __init__(self, obj1, obj2, anchor1=None, anchor2=None):
@@ -691,15 +913,18 @@ class Rod:
         self.point_constraint1 = None
         self.point_constraint2 = None
 
-        p1 = self._get_position(obj1, anchor1)
-        p2 = self._get_position(obj2, anchor2)
+        is_box1 = isinstance(obj1, Box)
+        is_box2 = isinstance(obj2, Box)
+        # resolved once so endpoint lookups skip the isinstance check
+        self._anchored1 = bool(is_box1 and anchor1)
+        self._anchored2 = bool(is_box2 and anchor2)
+
+        p1 = self._get_position(obj1, anchor1, self._anchored1)
+        p2 = self._get_position(obj2, anchor2, self._anchored2)
         dx = p2.x - p1.x
         dy = p2.y - p1.y
         self.length = (dx * dx + dy * dy) ** 0.5
 
-        is_box1 = isinstance(obj1, Box)
-        is_box2 = isinstance(obj2, Box)
-
         if is_box1 and anchor1 and not is_box2:
             self.point_constraint1 = BoxBobDistanceConstraint(
                 obj1, anchor1, obj2, self.length
@@ -715,19 +940,24 @@ class Rod:
 
         self.name = f"Rod_{self.id}"
 
-    def _get_position(self, obj, anchor):
-        if isinstance(obj, Box) and anchor:
+    def _get_position(self, obj, anchor, anchored):
+        if anchored:
             return obj.get_world_anchor(anchor)
         return obj.body.position
 
     def get_endpoint1(self):
-        pos = self._get_position(self.bob1, self.anchor1)
+        pos = self._get_position(self.bob1, self.anchor1, self._anchored1)
         return (pos.x, pos.y)
 
     def get_endpoint2(self):
-        pos = self._get_position(self.bob2, self.anchor2)
+        pos = self._get_position(self.bob2, self.anchor2, self._anchored2)
         return (pos.x, pos.y)
 
+    def _get_endpoints(self):
+        p1 = self._get_position(self.bob1, self.anchor1, self._anchored1)
+        p2 = self._get_position(self.bob2, self.anchor2, self._anchored2)
+        return p1.x, p1.y, p2.x, p2.y
+
     def solve(self):
         if self.point_constraint1:
             self.point_constraint1.solve()
@@ -737,36 +967,28 @@ class Rod:
             self.constraint.solve()
 
     def contains(self, x, y):
-        x1, y1 = self.get_endpoint1()
-        x2, y2 = self.get_endpoint2()
+        x1, y1, x2, y2 = self._get_endpoints()
 
-        line_len = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-        if line_len == 0:
+        ex = x2 - x1
+        ey = y2 - y1
+        line_len2 = ex * ex + ey * ey
+        if line_len2 == 0:
             return False
 
-        t = max(
-            0,
-            min(
-                1, ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / (line_len**2)
-            ),
-        )
-        proj_x = x1 + t * (x2 - x1)
-        proj_y = y1 + t * (y2 - y1)
+        t = ((x - x1) * ex + (y - y1) * ey) / line_len2
+        t = 0 if t < 0 else (1 if t > 1 else t)
+        dx = x - (x1 + t * ex)
+        dy = y - (y1 + t * ey)
 
-        dist = ((x - proj_x) ** 2 + (y - proj_y) ** 2) ** 0.5
-        return dist <= 8
+        return dx * dx + dy * dy <= 64
 
     def cur_length(self):
-        p1 = self._get_position(self.bob1, self.anchor1)
-        p2 = self._get_position(self.bob2, self.anchor2)
-        dx = p2.x - p1.x
-        dy = p2.y - p1.y
-        return (dx * dx + dy * dy) ** 0.5
+        x1, y1, x2, y2 = self._get_endpoints()
+        return math.hypot(x2 - x1, y2 - y1)
 
     def get_debug_info(self):
-        current_len = self.cur_length()
-        p1 = self.get_endpoint1()
-        p2 = self.get_endpoint2()
+        x1, y1, x2, y2 = self._get_endpoints()
+        current_len = math.hypot(x2 - x1, y2 - y1)
         return {
             "type": "Rod",
             "id": self.id,
@@ -778,25 +1000,41 @@ class Rod:
             "rest_length": round(self.length, 2),
             "current_length": round(current_len, 2),
             "stretch": round(current_len - self.length, 2),
-            "bob1.x": round(p1[0], 2),
-            "bob1.y": round(p1[1], 2),
-            "bob2.x": round(p2[0], 2),
-            "bob2.y": round(p2[1], 2),
+            "bob1.x": round(x1, 2),
+            "bob1.y": round(y1, 2),
+            "bob2.x": round(x2, 2),
+            "bob2.y": round(y2, 2),
         }
 
+    def _set_rest_length(self, value):
+        self.length = max(1, float(value))
+        if self.constraint:
+            self.constraint.l = self.length
+
+    def _set_bob1_x(self, value):
+        self.bob1.body.position.x = float(value)
+
+    def _set_bob1_y(self, value):
+        self.bob1.body.position.y = float(value)
+
+    def _set_bob2_x(self, value):
+        self.bob2.body.position.x = float(value)
+
+    def _set_bob2_y(self, value):
+        self.bob2.body.position.y = float(value)
+
+    _SETTERS = {
+        "rest_length": _set_rest_length,
+        "bob1.x": _set_bob1_x,
+        "bob1.y": _set_bob1_y,
+        "bob2.x": _set_bob2_x,
+        "bob2.y": _set_bob2_y,
+    }
+
     def set_property(self, key, value):
-        if key == "rest_length":
-            self.length = max(1, float(value))
-            if self.constraint:
-                self.constraint.l = self.length
-        elif key == "bob1.x":
-            self.bob1.body.position.x = float(value)
-        elif key == "bob1.y":
-            self.bob1.body.position.y = float(value)
-        elif key == "bob2.x":
-            self.bob2.body.position.x = float(value)
-        elif key == "bob2.y":
-            self.bob2.body.position.y = float(value)
+        setter = self._SETTERS.get(key)
+        if setter is not None:
+            setter(self, value)
 
 
 class SimulationEngine:
@@ -806,6 +1044,7 @@ class SimulationEngine:
         self.bobs = []
         self.boxes = []
         self.rods = []
+        self._rods_by_obj = {}
         self.actuators = []
         self.joints = []
         self.motors = []
@@ -815,6 +1054,11 @@ class SimulationEngine:
         self.dragging_box = None
         self.dragging_joint = None
         self.collision_handler = Collision_Handler()
+        self._pick_grids = {}
+        self._integration_list = None
+        self._solver_list = None
+        self._awake = True
+        self._settled = False
         self.ground = self.create_box(
             width / 2, height - 20, 10000000000000000000, 40, pinned=True
         )
@@ -824,6 +1068,8 @@ class SimulationEngine:
         bob = Bob(x, y, pinned)
         self.bobs.append(bob)
         self.collision_handler.add_body(bob.body)
+        self.invalidate_picking()
+        self.invalidate_bodies()
         return bob
 
     def create_box(
@@ -832,19 +1078,31 @@ class SimulationEngine:
         box = Box(x, y, width, height, pinned)
         self.boxes.append(box)
         self.collision_handler.add_body(box.body)
+        self.invalidate_picking()
+        self.invalidate_bodies()
         return box
 
     def delete_box(self, box):
-        self.rods = [r for r in self.rods if r.bob1 != box and r.bob2 != box]
+        self._delete_rods_of(box)
         self.actuators = [
             a for a in self.actuators if a.obj1 != box and a.obj2 != box
         ]
-        if box in self.boxes:
+        try:
             self.boxes.remove(box)
+        except ValueError:
+            pass
+        else:
             self.collision_handler.remove_body(box.body)
+        self.invalidate_picking()
+        self.invalidate_bodies()
 
     def get_box_at(self, x, y):
-        for box in reversed(self.boxes):
+        if self.running:
+            for box in reversed(self.boxes):
+                if box.contains(x, y):
+                    return box
+            return None
+        for _, box in self._pick_grid("box").query(x, y):
             if box.contains(x, y):
                 return box
         return None
@@ -861,84 +1119,269 @@ class SimulationEngine:
     def force_at(self, x, y, fx, fy):
         body = self.body_at(x, y)
         if body:
-            body.body.apply_point_force(Vector(fx, fy), Vector(x, y))
+            body.body.apply_force_at(fx, fy, x, y)
+            self.wake()
             return body
         return None
 
+    def _delete_rods_of(self, obj):
+        # only the rods attached to obj are visited; the rod list itself is
+        # filtered (not swap-popped) so draw, pick and save order is kept
+        doomed = self._rods_by_obj.pop(obj, None)
+        if not doomed:
+            return
+        doomed = set(doomed)
+        self.rods = [r for r in self.rods if r not in doomed]
+        self.invalidate_constraints()
+        for rod in doomed:
+            other = rod.bob2 if rod.bob1 is obj else rod.bob1
+            attached = self._rods_by_obj.get(other)
+            if attached is not None:
+                attached.remove(rod)
+
     def create_rod(self, bob1, bob2, anchor1=None, anchor2=None):
         rod = Rod(bob1, bob2, anchor1, anchor2)
         self.rods.append(rod)
+        self.invalidate_constraints()
+        self._rods_by_obj.setdefault(bob1, []).append(rod)
+        if bob2 is not bob1:
+            self._rods_by_obj.setdefault(bob2, []).append(rod)
+        self.invalidate_picking()
         return rod
 
     def create_actuator(self, obj1, obj2, anchor1=None, anchor2=None):
         actuator = Actuator(obj1, obj2, anchor1, anchor2)
         self.actuators.append(actuator)
+        self.invalidate_picking()
         return actuator
 
     def create_joint(self, x, y):
         joint = JointWrapper(x, y)
         self.joints.append(joint)
+        self.invalidate_picking()
+        self.invalidate_bodies()
         return joint
 
     def get_joint_at(self, x, y):
-        for joint in reversed(self.joints):
+        if self.running:
+            for joint in reversed(self.joints):
+                if joint.contains(x, y):
+                    return joint
+            return None
+        for _, joint in self._pick_grid("joint").query(x, y):
             if joint.contains(x, y):
                 return joint
         return None
 
     def delete_joint(self, joint):
-        if joint in self.joints:
+        try:
             self.joints.remove(joint)
+        except ValueError:
+            return
+        self.invalidate_picking()
+        self.invalidate_bodies()
+        self.invalidate_constraints()
 
     def connect_to_joint(self, joint, body, anchor=None):
         joint.connect(body, anchor)
+        self.invalidate_constraints()
 
     def create_motor(self, joint_wrapper, body1, body2, min_angle=-math.pi, max_angle=math.pi):
         motor = MotorWrapper(joint_wrapper, body1, body2, min_angle, max_angle)
         self.motors.append(motor)
+        self.invalidate_picking()
         return motor
 
+    @staticmethod
+    def _motor_contains(motor, x, y):
+        jx = motor.joint_wrapper.joint.position.x
+        jy = motor.joint_wrapper.joint.position.y
+        dx = x - jx
+        dy = y - jy
+        return (dx * dx + dy * dy) <= (motor.joint_wrapper.radius + 12) ** 2
+
     def get_motor_at(self, x, y):
-        for motor in reversed(self.motors):
-            jx = motor.joint_wrapper.joint.position.x
-            jy = motor.joint_wrapper.joint.position.y
-            dx = x - jx
-            dy = y - jy
-            if (dx * dx + dy * dy) <= (motor.joint_wrapper.radius + 12) ** 2:
+        if self.running:
+            for motor in reversed(self.motors):
+                if self._motor_contains(motor, x, y):
+                    return motor
+            return None
+        for _, motor in self._pick_grid("motor").query(x, y):
+            if self._motor_contains(motor, x, y):
                 return motor
         return None
 
     def delete_motor(self, motor):
-        if motor in self.motors:
+        try:
             self.motors.remove(motor)
+        except ValueError:
+            return
+        self.invalidate_picking()
 
     def get_actuator_at(self, x, y):
-        for actuator in reversed(self.actuators):
+        if self.running:
+            for actuator in reversed(self.actuators):
+                if actuator.contains(x, y):
+                    return actuator
+            return None
+        for _, actuator in self._pick_grid("actuator").query(x, y):
             if actuator.contains(x, y):
                 return actuator
         return None
 
     def delete_actuator(self, actuator):
-        if actuator in self.actuators:
+        try:
             self.actuators.remove(actuator)
+        except ValueError:
+            return
+        self.invalidate_picking()
 
     def delete_bob(self, bob):
-        self.rods = [r for r in self.rods if r.bob1 != bob and r.bob2 != bob]
+        self._delete_rods_of(bob)
         self.actuators = [
             a for a in self.actuators if a.obj1 != bob and a.obj2 != bob
         ]
-        if bob in self.bobs:
+        try:
             self.bobs.remove(bob)
+        except ValueError:
+            pass
+        else:
             self.collision_handler.remove_body(bob.body)
+        self.invalidate_picking()
+        self.invalidate_bodies()
+
+    def invalidate_picking(self):
+        self._pick_grids = {}
+
+    def invalidate_bodies(self):
+        # call after adding/removing bodies or changing pinned/dragging state
+        self._integration_list = None
+        self.wake()
+
+    def invalidate_constraints(self):
+        # call after adding/removing rods or joint connections
+        self._solver_list = None
+        self.wake()
+
+    def wake(self):
+        # forces the next update to run the solvers even if nothing moves
+        self._awake = True
+
+    def _at_rest(self):
+        # nothing driven, nothing edited and every integrated body (nearly)
+        # still; with gravity on, free bodies never pass this
+        if self._awake or self.actuators or self.motors:
+            return False
+        for body, _ in self._integrated_bodies():
+            velocity = body.velocity
+            if (
+                velocity.x * velocity.x + velocity.y * velocity.y
+                >= REST_SPEED_SQ
+            ):
+                return False
+            if body.ang_velocity * body.ang_velocity >= REST_SPEED_SQ:
+                return False
+        return True
+
+    def _body_state(self):
+        return [
+            (
+                body.position.x,
+                body.position.y,
+                body.orientation,
+                body.velocity.x,
+                body.velocity.y,
+                body.ang_velocity,
+            )
+            for body, _ in self._integrated_bodies()
+        ]
+
+    def _pick_grid(self, kind):
+        # only used while paused; a running simulation moves everything each
+        # frame, so the grid would be rebuilt for every query anyway
+        grid = self._pick_grids.get(kind)
+        if grid is not None:
+            return grid
+        grid = SpatialHash(PICK_CELL_SIZE)
+        if kind == "bob":
+            for i, bob in enumerate(self.bobs):
+                pos = bob.body.position
+                reach = bob.radius + 8
+                grid.insert(
+                    i, bob, pos.x - reach, pos.y - reach, pos.x + reach, pos.y + reach
+                )
+        elif kind == "box":
+            for i, box in enumerate(self.boxes):
+                pos = box.body.position
+                # box.contains accepts a 5px margin around the rotated box;
+                # 1px of slack covers rounding at the rotated edges
+                hw = box.width / 2 + 6
+                hh = box.height / 2 + 6
+                c = abs(math.cos(box.body.orientation))
+                s = abs(math.sin(box.body.orientation))
+                ex = hw * c + hh * s
+                ey = hw * s + hh * c
+                grid.insert(i, box, pos.x - ex, pos.y - ey, pos.x + ex, pos.y + ey)
+        elif kind == "rod":
+            for i, rod in enumerate(self.rods):
+                x1, y1 = rod.get_endpoint1()
+                x2, y2 = rod.get_endpoint2()
+                grid.insert(
+                    i,
+                    rod,
+                    min(x1, x2) - 8,
+                    min(y1, y2) - 8,
+                    max(x1, x2) + 8,
+                    max(y1, y2) + 8,
+                )
+        elif kind == "joint":
+            for i, joint in enumerate(self.joints):
+                pos = joint.joint.position
+                reach = joint.radius + 8
+                grid.insert(
+                    i, joint, pos.x - reach, pos.y - reach, pos.x + reach, pos.y + reach
+                )
+        elif kind == "actuator":
+            # actuator.contains accepts points within 10px of the segment
+            for i, actuator in enumerate(self.actuators):
+                x1, y1 = actuator.get_endpoint1()
+                x2, y2 = actuator.get_endpoint2()
+                grid.insert(
+                    i,
+                    actuator,
+                    min(x1, x2) - 11,
+                    min(y1, y2) - 11,
+                    max(x1, x2) + 11,
+                    max(y1, y2) + 11,
+                )
+        elif kind == "motor":
+            for i, motor in enumerate(self.motors):
+                pos = motor.joint_wrapper.joint.position
+                reach = motor.joint_wrapper.radius + 12
+                grid.insert(
+                    i, motor, pos.x - reach, pos.y - reach, pos.x + reach, pos.y + reach
+                )
+        self._pick_grids[kind] = grid
+        return grid
 
     def get_bob_at(self, x, y):
-        for bob in reversed(self.bobs):
+        if self.running:
+            for bob in reversed(self.bobs):
+                if bob.contains(x, y):
+                    return bob
+            return None
+        for _, bob in self._pick_grid("bob").query(x, y):
             if bob.contains(x, y):
                 return bob
         return None
 
     def get_rod_at(self, x, y):
-        for rod in reversed(self.rods):
+        if self.running:
+            for rod in reversed(self.rods):
+                if rod.contains(x, y):
+                    return rod
+            return None
+        for _, rod in self._pick_grid("rod").query(x, y):
             if rod.contains(x, y):
                 return rod
         return None
@@ -951,21 +1394,29 @@ class SimulationEngine:
         obj.body.inv_moi = (
             0 if obj.pinned else (1 / obj.body.moi if obj.body.moi > 0 else 0)
         )
+        self.invalidate_bodies()
+
+    _DRAG_SLOTS = {
+        Bob: "dragging_bob",
+        Box: "dragging_box",
+        JointWrapper: "dragging_joint",
+    }
 
     def set_dragging(self, obj):
-        if isinstance(obj, Bob):
-            self.dragging_bob = obj
-        elif isinstance(obj, Box):
-            self.dragging_box = obj
-        elif isinstance(obj, JointWrapper):
-            self.dragging_joint = obj
+        slot = self._DRAG_SLOTS.get(type(obj))
+        if slot is not None:
+            setattr(self, slot, obj)
+        self.invalidate_bodies()
 
     def release(self):
         self.dragging_bob = None
         self.dragging_box = None
         self.dragging_joint = None
+        self.invalidate_bodies()
 
     def move(self, obj, x, y):
+        self.invalidate_picking()
+        self.wake()
         if isinstance(obj, JointWrapper):
             obj.joint.position.x = x
             obj.joint.position.y = y
@@ -986,6 +1437,7 @@ class SimulationEngine:
 
     def start(self):
         self.running = True
+        self.wake()
 
     def stop(self):
         self.running = False
@@ -1003,6 +1455,7 @@ class SimulationEngine:
         self.bobs = []
         self.boxes = []
         self.rods = []
+        self._rods_by_obj = {}
         self.actuators = []
         self.joints = []
         self.motors = []
@@ -1011,6 +1464,9 @@ class SimulationEngine:
         self.dragging_box = None
         self.dragging_joint = None
         self.collision_handler = Collision_Handler()
+        self.invalidate_picking()
+        self.invalidate_bodies()
+        self.invalidate_constraints()
         Bob._id_counter = 0
         Box._id_counter = 0
         Rod._id_counter = 0
@@ -1022,35 +1478,79 @@ class SimulationEngine:
         )
         self.collision_handler.set_ground(self.ground.body)
 
+    def _constraint_solvers(self):
+        # flattened, in the same order as rod.solve() then
+        # joint.solve_constraints(1), so one relaxation pass is a single loop;
+        # rebuilt only after invalidate_constraints()
+        solvers = self._solver_list
+        if solvers is not None:
+            return solvers
+        solvers = []
+        for rod in self.rods:
+            if rod.point_constraint1:
+                solvers.append(rod.point_constraint1.solve)
+            if rod.point_constraint2:
+                solvers.append(rod.point_constraint2.solve)
+            if rod.constraint:
+                solvers.append(rod.constraint.solve)
+        for joint in self.joints:
+            for constraint in joint.joint.constraints:
+                solvers.append(constraint.solve)
+        self._solver_list = solvers
+        return solvers
+
+    def _integrated_bodies(self):
+        # (body, gets_gravity) for everything that is integrated this frame;
+        # the dragged object is skipped and pinned bobs/boxes get no gravity
+        bodies = self._integration_list
+        if bodies is None:
+            bodies = []
+            for bob in self.bobs:
+                if bob is not self.dragging_bob:
+                    bodies.append((bob.body, not bob.pinned))
+            for box in self.boxes:
+                if box is not self.dragging_box:
+                    bodies.append((box.body, not box.pinned))
+            for joint in self.joints:
+                if joint is not self.dragging_joint:
+                    bodies.append((joint.joint, True))
+            self._integration_list = bodies
+        return bodies
+
+    def _integrate_bodies(self, dt):
+        # gravity acts through the centre of mass (no torque), so it goes
+        # straight into the acceleration instead of through the force
+        # accumulator; bodies without inverse mass stay put as before
+        gx = GRAVITY_X
+        gy = GRAVITY_Y
+        for body, gravity in self._integrated_bodies():
+            force = body.total_force
+            inv_mass = body.inv_mass
+            ax = force.x * inv_mass
+            ay = force.y * inv_mass
+            if gravity and inv_mass:
+                ax += gx
+                ay += gy
+            velocity = body.velocity
+            position = body.position
+            velocity.x += ax * dt
+            velocity.y += ay * dt
+            position.x += velocity.x * dt
+            position.y += velocity.y * dt
+
+            body.ang_velocity = (
+                body.ang_velocity + body.total_torque * body.inv_moi * dt
+            )
+            body.orientation += body.ang_velocity * dt
+            body.total_torque = 0.0
+            force.x = 0
+            force.y = 0
+
     def update(self, dt):
         if not self.running:
             return
 
-        for bob in self.bobs:
-            if bob != self.dragging_bob and not bob.pinned:
-                bob.body.apply_point_force(
-                    Vector(
-                        GRAVITY.x * bob.body.mass, GRAVITY.y * bob.body.mass
-                    ),
-                    bob.body.position,
-                )
-
-        for box in self.boxes:
-            if box != self.dragging_box and not box.pinned:
-                box.body.apply_point_force(
-                    Vector(
-                        GRAVITY.x * box.body.mass, GRAVITY.y * box.body.mass
-                    ),
-                    box.body.position,
-                )
-
-        for joint in self.joints:
-            if joint != self.dragging_joint:
-                joint.apply_force(
-                    Vector(
-                        GRAVITY.x * joint.joint.mass, GRAVITY.y * joint.joint.mass
-                    )
-                )
+        self.invalidate_picking()
 
         for actuator in self.actuators:
             actuator.apply_forces(dt)
@@ -1058,26 +1558,28 @@ class SimulationEngine:
         for motor in self.motors:
             motor.update()
 
-        for bob in self.bobs:
-            if bob != self.dragging_bob:
-                bob.body.integrate(dt)
+        self._integrate_bodies(dt)
 
-        for box in self.boxes:
-            if box != self.dragging_box:
-                box.body.integrate(dt)
-
-        for joint in self.joints:
-            if joint != self.dragging_joint:
-                joint.integrate(dt)
+        # an idle scene (no gravity or everything pinned, nothing driven or
+        # touched) skips the constraint and collision passes, but only once
+        # a pass over it has stopped changing anything: positional
+        # corrections (e.g. pushing apart an overlap) add no velocity, so
+        # the velocity check alone would freeze them half done
+        at_rest = self._at_rest()
+        self._awake = False
+        if at_rest and self._settled:
+            return
+        before = self._body_state() if at_rest else None
 
+        solvers = self._constraint_solvers()
         for _ in range(self.iterations):
-            for rod in self.rods:
-                rod.solve()
-            for joint in self.joints:
-                joint.solve_constraints(1)
+            for solve in solvers:
+                solve()
 
         self.collision_handler.update()
 
+        self._settled = at_rest and self._body_state() == before
+
         # for bob in self.bobs:
         #     if bob.body.position.y > self.height - BOB_RADIUS:
         #         bob.body.position.y = self.height - BOB_RADIUS
@@ -1113,61 +1615,58 @@ class SimulationEngine:
             "joint_count": len(self.joints),
             "motor_count": len(self.motors),
             "iterations": self.iterations,
-            "gravity.x": GRAVITY.x,
-            "gravity.y": GRAVITY.y,
+            "gravity.x": GRAVITY_X,
+            "gravity.y": GRAVITY_Y,
             "fps": int(fps),
             "dt": round(dt * 1000, 2),
         }
 
     def set_property(self, key, value):
-        global GRAVITY
+        global GRAVITY_X, GRAVITY_Y
+        self.wake()
         if key == "iterations":
             self.iterations = max(1, int(value))
         elif key == "gravity.x":
-            GRAVITY = Vector(float(value), GRAVITY.y)
+            GRAVITY_X = float(value)
         elif key == "gravity.y":
-            GRAVITY = Vector(GRAVITY.x, float(value))
+            GRAVITY_Y = float(value)
 
     def serialize(self):
-        bob_map = {}
-        bobs_data = []
-        for i, bob in enumerate(self.bobs):
-            bob_map[bob] = i
-            bobs_data.append(
-                {
-                    "x": bob.body.position.x,
-                    "y": bob.body.position.y,
-                    "pinned": bob.pinned,
-                    "radius": bob.radius,
-                    "mass": bob.body.mass,
-                }
-            )
+        # every saved bob/box maps to its (type, index) so each rod, actuator,
+        # joint and motor endpoint resolves with a single lookup
+        refs = {bob: ("bob", i) for i, bob in enumerate(self.bobs)}
+        missing = ("box", -1)
+        bobs_data = [
+            {
+                "x": bob.body.position.x,
+                "y": bob.body.position.y,
+                "pinned": bob.pinned,
+                "radius": bob.radius,
+                "mass": bob.body.mass,
+            }
+            for bob in self.bobs
+        ]
 
-        box_map = {}
-        boxes_data = []
-        box_idx = 0
-        for box in self.boxes:
-            if box == self.ground:
-                continue
-            box_map[box] = box_idx
-            boxes_data.append(
-                {
-                    "x": box.body.position.x,
-                    "y": box.body.position.y,
-                    "width": box.width,
-                    "height": box.height,
-                    "pinned": box.pinned,
-                    "orientation": box.body.orientation,
-                }
-            )
-            box_idx += 1
+        ground = self.ground
+        boxes = [box for box in self.boxes if box is not ground]
+        for i, box in enumerate(boxes):
+            refs[box] = ("box", i)
+        boxes_data = [
+            {
+                "x": box.body.position.x,
+                "y": box.body.position.y,
+                "width": box.width,
+                "height": box.height,
+                "pinned": box.pinned,
+                "orientation": box.body.orientation,
+            }
+            for box in boxes
+        ]
 
         rods_data = []
         for rod in self.rods:
-            bob1_type = "bob" if rod.bob1 in bob_map else "box"
-            bob2_type = "bob" if rod.bob2 in bob_map else "box"
-            bob1_idx = bob_map.get(rod.bob1, box_map.get(rod.bob1, -1))
-            bob2_idx = bob_map.get(rod.bob2, box_map.get(rod.bob2, -1))
+            bob1_type, bob1_idx = refs.get(rod.bob1, missing)
+            bob2_type, bob2_idx = refs.get(rod.bob2, missing)
             if bob1_idx >= 0 and bob2_idx >= 0:
                 rods_data.append(
                     {
@@ -1183,14 +1682,8 @@ class SimulationEngine:
 
         actuators_data = []
         for actuator in self.actuators:
-            obj1_type = "bob" if actuator.obj1 in bob_map else "box"
-            obj2_type = "bob" if actuator.obj2 in bob_map else "box"
-            obj1_idx = bob_map.get(
-                actuator.obj1, box_map.get(actuator.obj1, -1)
-            )
-            obj2_idx = bob_map.get(
-                actuator.obj2, box_map.get(actuator.obj2, -1)
-            )
+            obj1_type, obj1_idx = refs.get(actuator.obj1, missing)
+            obj2_type, obj2_idx = refs.get(actuator.obj2, missing)
             if obj1_idx >= 0 and obj2_idx >= 0:
                 actuators_data.append(
                     {
@@ -1207,22 +1700,16 @@ class SimulationEngine:
                     }
                 )
 
-        joint_map = {}
+        joint_map = {joint: i for i, joint in enumerate(self.joints)}
         joints_data = []
-        for i, joint in enumerate(self.joints):
-            joint_map[joint] = i
+        for joint in self.joints:
             connections = []
             for body, anchor, constraint in joint.connected_bodies:
-                if body in bob_map:
+                ref = refs.get(body)
+                if ref is not None:
                     connections.append({
-                        "body_type": "bob",
-                        "body_idx": bob_map[body],
-                        "anchor": anchor,
-                    })
-                elif body in box_map:
-                    connections.append({
-                        "body_type": "box",
-                        "body_idx": box_map[body],
+                        "body_type": ref[0],
+                        "body_idx": ref[1],
                         "anchor": anchor,
                     })
             joints_data.append({
@@ -1237,10 +1724,8 @@ class SimulationEngine:
         motors_data = []
         for motor in self.motors:
             joint_idx = joint_map.get(motor.joint_wrapper, -1)
-            body1_type = "bob" if motor.body1 in bob_map else "box"
-            body2_type = "bob" if motor.body2 in bob_map else "box"
-            body1_idx = bob_map.get(motor.body1, box_map.get(motor.body1, -1))
-            body2_idx = bob_map.get(motor.body2, box_map.get(motor.body2, -1))
+            body1_type, body1_idx = refs.get(motor.body1, missing)
+            body2_type, body2_idx = refs.get(motor.body2, missing)
             if joint_idx >= 0 and body1_idx >= 0 and body2_idx >= 0:
                 motors_data.append({
                     "joint_idx": joint_idx,
@@ -1377,7 +1862,7 @@ class SimulationEngine:
                     else box_map.get(body_idx)
                 )
                 if body:
-                    joint.connect(body, anchor)
+                    self.connect_to_joint(joint, body, anchor)
 
         for motor_data in data.get("motors", []):
             joint_idx = motor_data.get("joint_idx", -1)
@@ -1413,26 +1898,63 @@ class SimulationEngine:
                         motor.motor.max_torque = motor_data["max_torque"]
 
 
+# parsed templates.json, reused until the file's mtime or size changes;
+# callers get their own top-level dict, so adding or dropping names never
+# touches the cache (the template bodies themselves are only ever read)
+_templates_cache = None
+_templates_stamp = None
+
+
+def _templates_file_stamp():
+    st = os.stat(TEMPLATES_FILE)
+    return (st.st_mtime_ns, st.st_size)
+
+
 def load_templates():
-    if os.path.exists(TEMPLATES_FILE):
+    global _templates_cache, _templates_stamp
+    try:
+        stamp = _templates_file_stamp()
+    except OSError:
+        return {}
+    if _templates_cache is not None and stamp == _templates_stamp:
+        return dict(_templates_cache)
+    try:
+        with open(TEMPLATES_FILE, "r") as f:
+            templates = json.load(f)
+    except:
+        return {}
+    _templates_cache = templates
+    _templates_stamp = stamp
+    return dict(templates)
+
+
+def _write_templates(templates):
+    global _templates_cache, _templates_stamp
+    # written beside the real file and swapped in, so a crash mid-save
+    # can't leave a truncated templates.json behind
+    tmp_path = TEMPLATES_FILE + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(templates, f, indent=2)
+        os.replace(tmp_path, TEMPLATES_FILE)
+    except BaseException:
         try:
-            with open(TEMPLATES_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _templates_cache = templates
+    _templates_stamp = _templates_file_stamp()
 
 
 def save_template(name, data):
     templates = load_templates()
     templates[name] = data
-    with open(TEMPLATES_FILE, "w") as f:
-        json.dump(templates, f, indent=2)
+    _write_templates(templates)
 
 
 def delete_template(name):
     templates = load_templates()
     if name in templates:
         del templates[name]
-        with open(TEMPLATES_FILE, "w") as f:
-            json.dump(templates, f, indent=2)
+        _write_templates(templates)
@@ -5,7 +5,6 @@ from simulation import (
     BOB_RADIUS,
     BOX_WIDTH,
     BOX_HEIGHT,
-    GRAVITY,
     FORCE_MAGNITUDE,
     load_templates,
     save_template,
@@ -313,6 +312,7 @@ class DebugPanel:
         self.component_list = []
         self.hovered_item = None
         self.collapsed_categories = set()
+        self.frame_debug_info = None
 
     def set_engine(self, engine):
         self.engine = engine
@@ -335,7 +335,7 @@ class DebugPanel:
 
         categories = [
             ("Bobs", [b for b in self.engine.bobs]),
-            ("Boxes", [b for b in self.engine.boxes if b != self.engine.ground]),
+            ("Boxes", [b for b in self.engine.boxes if b is not self.engine.ground]),
             ("Rods", self.engine.rods),
             ("Actuators", self.engine.actuators),
             ("Joints", self.engine.joints),
@@ -349,6 +349,11 @@ class DebugPanel:
                     for item in items:
                         self.component_list.append({"type": "item", "category": cat_name, "obj": item})
 
+    def _selected_debug_info(self):
+        if hasattr(self.selected_object, "get_debug_info"):
+            return self.selected_object.get_debug_info()
+        return self.selected_object
+
     def _rebuild_fields(self):
         self.input_fields = []
         self.active_field = None
@@ -356,10 +361,7 @@ class DebugPanel:
         if self.selected_object is None:
             return
 
-        if hasattr(self.selected_object, "get_debug_info"):
-            debug_info = self.selected_object.get_debug_info()
-        else:
-            debug_info = self.selected_object
+        debug_info = self._selected_debug_info()
 
         y_offset = 135
         label_width = 95
@@ -393,6 +395,9 @@ class DebugPanel:
             self.selected_object, "set_property"
         ):
             self.selected_object.set_property(key, new_value)
+            if self.engine:
+                self.engine.invalidate_picking()
+                self.engine.invalidate_bodies()
             self._rebuild_fields()
 
     def handle_event(self, event):
@@ -479,13 +484,13 @@ class DebugPanel:
         for _, field in self.input_fields:
             field.update(dt)
 
-        if self.selected_object is None:
+        # the inspector is only refreshed while it is on screen; the info is
+        # kept for this frame's draw so it is built once per frame
+        if self.selected_object is None or not self.visible:
             return
 
-        if hasattr(self.selected_object, "get_debug_info"):
-            debug_info = self.selected_object.get_debug_info()
-        else:
-            debug_info = self.selected_object
+        debug_info = self._selected_debug_info()
+        self.frame_debug_info = (self.selected_object, debug_info)
 
         for key, field in self.input_fields:
             if field.active:
@@ -592,10 +597,12 @@ class DebugPanel:
                 hint2 = font_debug.render("Add bobs, boxes, etc.", True, DEBUG_LABEL)
                 panel_surface.blit(hint2, (15, 100))
         else:
-            if hasattr(self.selected_object, "get_debug_info"):
-                debug_info = self.selected_object.get_debug_info()
+            cached = self.frame_debug_info
+            if cached is not None and cached[0] is self.selected_object:
+                debug_info = cached[1]
             else:
-                debug_info = self.selected_object
+                debug_info = self._selected_debug_info()
+            self.frame_debug_info = None
 
             back_btn_rect = pygame.Rect(15, 58, 60, 26)
             pygame.draw.rect(panel_surface, BTN_COLOR, back_btn_rect, border_radius=4)
@@ -1393,7 +1400,7 @@ class SimulationUI:
                         self.engine.set_dragging(new_bob)
                         self.debug_panel.set_selected(new_bob)
                 elif self.mode == "box":
-                    if clicked_box and clicked_box != self.engine.ground:
+                    if clicked_box and clicked_box is not self.engine.ground:
                         handle = clicked_box.get_resize_handle_at(x, y)
                         if handle:
                             self.resizing_box = clicked_box
@@ -1554,12 +1561,10 @@ class SimulationUI:
                     scale = FORCE_MAGNITUDE * (length / 100)
                     force_x = (dx / length) * scale
                     force_y = (dy / length) * scale
-                    from simulation import Vector
-
-                    self.force_target.body.apply_point_force(
-                        Vector(force_x, force_y),
-                        Vector(self.force_start[0], self.force_start[1]),
+                    self.force_target.body.apply_force_at(
+                        force_x, force_y, self.force_start[0], self.force_start[1]
                     )
+                    self.engine.wake()
             self.force_start = None
             self.force_target = None
             self.resizing_box = None
@@ -1570,6 +1575,7 @@ class SimulationUI:
             if self.resizing_box and self.resize_handle:
                 x, y = event.pos
                 self.resizing_box.resize(self.resize_handle, x, y)
+                self.engine.invalidate_picking()
             elif self.engine.dragging_bob:
                 x, y = event.pos
                 y = max(CANVAS_TOP + BOB_RADIUS, y)
@@ -1766,7 +1772,7 @@ class SimulationUI:
                 )
                 pygame.draw.circle(surface, (0, 0, 0), (int(cx), int(cy)), 4)
 
-            if self.mode in ("rod", "actuator") and box != self.engine.ground:
+            if self.mode in ("rod", "actuator") and box is not self.engine.ground:
                 anchors = box.get_all_world_anchors()
                 for name, (ax, ay) in anchors.items():
                     ax_i, ay_i = int(ax) - cam, int(ay)
@@ -1786,7 +1792,7 @@ class SimulationUI:
                             surface, (255, 255, 255), (ax_i, ay_i), 5, 1
                         )
 
-            if self.mode == "box" and box != self.engine.ground:
+            if self.mode == "box" and box is not self.engine.ground:
                 handles = box.get_world_resize_handles()
                 active_handle = box.get_resize_handle_at(mx + cam, my)
                 for name, (hx, hy) in handles.items():